@@ -0,0 +1,75 @@
+from threading import Lock
+
+FIELDS = ['cpu', 'mem']
+SCALE = 1000
+
+contributions = dict()
+vertical_totals = dict()
+app_totals = dict()
+lock = Lock()
+
+
+def update(results):
+    with lock:
+        for app_id, task in results:
+            previous = contributions.pop(app_id, None)
+            if previous:
+                add(*previous, sign=-1)
+            if task is not None:
+                contributions[app_id] = get_contribution(task)
+                add(*contributions[app_id], sign=1)
+
+
+def get_contribution(task):
+    amounts = tuple(round(task["marathon"].get("instances", 0) * task["marathon"].get(field, 0) * SCALE)
+                    if "marathon" in task else 0 for field in FIELDS)
+    return task.get("vertical"), task.get("name"), task.get("full-name"), amounts
+
+
+def add(vertical, name, full_name, amounts, sign):
+    for key, totals in [((vertical, name), app_totals),
+                        (("all", full_name), app_totals),
+                        (vertical, vertical_totals),
+                        ("all", vertical_totals)]:
+        total = totals.setdefault(key, {'apps': 0, 'cpu': 0, 'mem': 0})
+        total['apps'] += sign
+        for field, amount in zip(FIELDS, amounts):
+            total[field] += sign * amount
+        if total['apps'] == 0:
+            del totals[key]
+
+
+def get_vertical(vertical):
+    with lock:
+        return to_resources(vertical_totals.get(vertical))
+
+
+def get_app(vertical, name):
+    with lock:
+        return to_resources(app_totals.get((vertical, name)))
+
+
+def get_totals():
+    with lock:
+        vertical_resources = {vertical: to_resources(total) for vertical, total in vertical_totals.items()}
+        app_resources = dict()
+        for (vertical, name), total in app_totals.items():
+            app_resources.setdefault(vertical, {})[name] = to_resources(total)
+        return vertical_resources, app_resources
+
+
+def to_resources(total):
+    if total is None:
+        return None
+    return {field: to_number(total[field]) for field in FIELDS}
+
+
+def to_number(amount):
+    return amount // SCALE if amount % SCALE == 0 else amount / SCALE
+
+
+def clear():
+    with lock:
+        contributions.clear()
+        vertical_totals.clear()
+        app_totals.clear()
@@ -0,0 +1,129 @@
+import base64
+import binascii
+import json
+
+from flask import Blueprint, Response, jsonify, request
+
+from app import allocation
+from app import ranking
+from app import snapshot
+from app import views
+from app.task import to_wire
+from app.util import get_in_dict
+
+blueprint = Blueprint('api', __name__)
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MISSING = object()
+
+
+@blueprint.route('/api/v1/apps', methods=['GET'])
+def apps():
+    try:
+        group_filter, name_filter, status_filter, type_filter, env_filter = views.get_filter_values()
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+        after = decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return bad_request('invalid level, limit or cursor')
+    if not 0 < limit <= MAX_LIMIT:
+        return bad_request('limit must be between 1 and ' + str(MAX_LIMIT))
+    fields = request.args.get('fields', False)
+
+    data = snapshot.get(views.build_snapshot)
+    filtered_apps = views.filter_state(app_list=data.apps,
+                                       name_filter=name_filter,
+                                       group_filter=group_filter,
+                                       type_filter=type_filter,
+                                       active_color_only_filter=request.args.get('active_color_only',
+                                                                                 'false') == 'true',
+                                       status_filter=status_filter,
+                                       include_jobs=request.args.get('jobs', 'true') == 'true',
+                                       include_age=request.args.get('status_age', 'true') == 'true',
+                                       env_filter=env_filter,
+                                       indexes=data.indexes)
+    page = [app for app in sorted(filtered_apps, key=sort_key) if after is None or sort_key(app) > after]
+    return Response(generate(data.version, page[:limit], fields.split(',') if fields else None,
+                             encode_cursor(sort_key(page[limit - 1])) if len(page) > limit else None),
+                    mimetype='application/json')
+
+
+@blueprint.route('/api/v1/resources', methods=['GET'])
+def resources():
+    vertical = request.args.get('vertical')
+    if vertical is None:
+        vertical_resources, app_resources = allocation.get_totals()
+        return jsonify({'verticals': vertical_resources, 'apps': app_resources})
+    name = request.args.get('app')
+    totals = allocation.get_app(vertical, name) if name else allocation.get_vertical(vertical)
+    if totals is None:
+        return not_found('no resources for ' + vertical + ('/' + name if name else ''))
+    return jsonify(totals)
+
+
+@blueprint.route('/api/v1/ranking', methods=['GET'])
+def worst_services():
+    vertical = request.args.get('vertical', 'all')
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return bad_request('invalid limit')
+    if not 0 < limit <= MAX_LIMIT:
+        return bad_request('limit must be between 1 and ' + str(MAX_LIMIT))
+    return jsonify({'vertical': vertical,
+                    'services': [{'name': name, 'severity': severity}
+                                 for name, severity in ranking.top(vertical, limit)]})
+
+
+def generate(version, page, fields, next_cursor):
+    yield '{"version": ' + json.dumps(version) + ', "apps": ['
+    for index, app in enumerate(page):
+        yield (', ' if index else '') + json.dumps(project(app, fields) if fields else app, default=to_wire)
+    yield '], "next": ' + json.dumps(next_cursor) + '}'
+
+
+def sort_key(app):
+    return [-app["severity"], app["full-name"], app["group"], app["color"], app.get("id", ""),
+            get_in_dict(["marathon", "origin"], app, "")]
+
+
+def project(app, fields):
+    projection = dict()
+    for field in fields:
+        path = field.split('.')
+        value = get_in_dict(path, app, MISSING)
+        if value is not MISSING:
+            target = projection
+            for key in path[:-1]:
+                target = target.setdefault(key, dict())
+            target[path[-1]] = value
+    return projection
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError) as error:
+        raise ValueError(error)
+    if not isinstance(key, list) or len(key) != 6 or not isinstance(key[0], (int, float)) \
+            or not all(isinstance(value, str) for value in key[1:]):
+        raise ValueError(cursor)
+    return key
+
+
+def bad_request(message):
+    resp = jsonify({'status': 400, 'message': message})
+    resp.status_code = 400
+    return resp
+
+
+def not_found(message):
+    resp = jsonify({'status': 404, 'message': message})
+    resp.status_code = 404
+    return resp
@@ -7,6 +7,14 @@ navigation_bar = [('views.monitor', 'Status'),
 
 THREAD_SUFFIX = "-thread"
 THREAD_UPDATE_INTERVAL = 60
+DEFAULT_CONCURRENCY = 10
+DEFAULT_POOL_CONNECTIONS = 1000
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MIN_PROBE_INTERVAL = 0
+DEFAULT_MAX_PROBE_INTERVAL = 0
+PAGE_CACHE_SIZE = 128
+TILE_CACHE_SIZE = 10000
+STREAM_BUFFER_SIZE = 64
 
 config = None
 info = None
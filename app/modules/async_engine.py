@@ -0,0 +1,152 @@
+import asyncio
+import json
+from threading import Thread
+from flask import logging
+
+import aiohttp
+
+from app import config
+from app.modules import aws
+from app.modules import marathon
+from app.modules import scheduler
+from app.modules import standalone
+
+logger = logging.getLogger(__name__)
+
+
+def start(jobs, interval, greedy=False):
+    loop = asyncio.new_event_loop()
+    Thread(target=loop.run_until_complete,
+           args=(run(jobs, interval, greedy),),
+           name="async-engine",
+           daemon=True).start()
+    return loop
+
+
+async def run(jobs, interval, greedy=False):
+    connector = aiohttp.TCPConnector(limit=0, ssl=False)
+    async with aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar()) as session:
+        await asyncio.gather(*[schedule(collectors[source], session, thread_id, cfg, interval, greedy)
+                               for source, thread_id, cfg in jobs])
+
+
+async def schedule(collector, session, thread_id, cfg, interval, greedy=False):
+    while True:
+        try:
+            await collector(session, thread_id, cfg)
+        except Exception as error:
+            logger.error(' '.join(["collector", collector.__name__, "failed", "[", error.__class__.__name__, "]"]),
+                         exc_info=True)
+        if greedy:
+            return
+        await asyncio.sleep(interval)
+
+
+async def update_marathon(session, thread_id, cfg):
+    app_list = await get_apps(session, cfg)
+    blacklist = marathon.get_blacklist(cfg)
+    semaphore = asyncio.Semaphore(int(cfg.get('concurrency', config.DEFAULT_CONCURRENCY)))
+    results = await asyncio.gather(*[collect_task(session, semaphore, app, cfg, blacklist) for app in app_list])
+    marathon.save_tasks(thread_id, cfg, results)
+    logger.debug("Finish update for " + cfg['host'])
+
+
+async def update_standalone(session, thread_id, service_list):
+    results = await asyncio.gather(*[get_service_info(session, service) for service in service_list])
+    standalone.save_tasks([("standalone::" + service["id"], task) for service, task in zip(service_list, results)])
+    logger.debug("Finish update for services")
+
+
+async def update_aws(session, thread_id, service):
+    loop = asyncio.get_event_loop()
+    beanstalk_client = await loop.run_in_executor(None, aws.get_beanstalk_client, service['region_name'],
+                                                  service['access_key'], service['secret_key'])
+    application_environment_mapping = await loop.run_in_executor(None, aws.get_beanstalk_environments,
+                                                                 beanstalk_client)
+    app_ids = ["aws::" + service["id"] + '/' + application for application in application_environment_mapping]
+    results = await asyncio.gather(*[get_beanstalk_health(session, service, beanstalk_client, app_id, environment)
+                                     for app_id, environment in zip(app_ids,
+                                                                    application_environment_mapping.values())])
+    aws.save_tasks(list(zip(app_ids, results)))
+    logger.debug("Finish update for aws")
+
+
+async def get_apps(session, cfg):
+    try:
+        async with session.get(marathon.get_apps_url(cfg),
+                               headers=marathon.get_apps_headers(cfg),
+                               timeout=aiohttp.ClientTimeout(total=5)) as response:
+            return marathon.read_apps(cfg, response.status, response.headers, await response.text())
+    except (ValueError, asyncio.TimeoutError, aiohttp.ClientError) as error:
+        return marathon.read_apps_cache(cfg, error)
+
+
+async def collect_task(session, semaphore, app, cfg, blacklist):
+    try:
+        app_id = marathon.get_app_id(app, blacklist)
+        if app_id:
+            async with semaphore:
+                return app_id, await get_task_info(session, app, cfg)
+    except Exception as error:
+        marathon.log_app_error(cfg, app, error)
+    return None, None
+
+
+async def get_task_info(session, app, cfg):
+    task, status_path = marathon.create_task(app, cfg)
+    if status_path and task["marathon"]["instances"] > 0:
+        key = "marathon::" + task["id"]
+        result = scheduler.get_result(key, task, cfg)
+        if result is not None:
+            return marathon.set_probe_result(task, result)
+        result = await probe_status_page(session, task, cfg)
+        return scheduler.record(key, marathon.set_probe_result(task, result), cfg, result)
+    return marathon.set_status(task, {}, None, None)
+
+
+async def probe_status_page(session, task, cfg):
+    status_url = task["status_url"]
+    status_page_data, active_color, status_page_code = await get_application_status(session, status_url, cfg)
+    if marathon.is_staged(task, active_color):
+        status_url = marathon.get_staged_url(status_url)
+        status_page_data, _, status_page_code = await get_application_status(session, status_url, cfg)
+    return status_url, status_page_data, active_color, status_page_code
+
+
+async def get_service_info(session, service):
+    task = standalone.create_task(service)
+    key = "standalone::" + service["id"]
+    result = scheduler.get_result(key, task, service)
+    if result is not None:
+        return standalone.set_probe_result(task, result)
+    result = await get_application_status(session, service["url"], service)
+    return scheduler.record(key, standalone.set_probe_result(task, result), service, result)
+
+
+async def get_beanstalk_health(session, service, beanstalk_client, app_id, environment_name):
+    response = await asyncio.get_event_loop().run_in_executor(None, aws.describe_environment_health,
+                                                              beanstalk_client, environment_name)
+    task = aws.create_task(service, app_id, environment_name, response)
+    status_page_data, _, status_page_code = await get_application_status(session, task["status_url"], {})
+    return aws.set_status(task, status_page_data, status_page_code)
+
+
+async def get_application_status(session, status_url, cfg):
+    status_code = None
+    try:
+        async with session.get(status_url,
+                               headers=cfg['headers'] if 'headers' in cfg else {},
+                               cookies=cfg['cookies'] if 'cookies' in cfg else {},
+                               timeout=aiohttp.ClientTimeout(total=5)) as response:
+            active_color = response.headers.get('x-color', None)
+            status_code = response.status
+            status_page_data = json.loads(await response.text())
+    except (ValueError, asyncio.TimeoutError, aiohttp.ClientError) as error:
+        logger.warning(' '.join(["could not read status page:", status_url, "[", error.__class__.__name__, "]"]))
+        return {}, None, status_code
+    return status_page_data, active_color, status_code
+
+
+collectors = {'marathon': update_marathon,
+              'standalone': update_standalone,
+              'aws': update_aws}
@@ -1,12 +1,12 @@
-import json
 from threading import Timer
 from flask import logging
 
 import boto3
 
 from app import config
+from app import snapshot
+from app import store
 from app.modules import util
-from app.util import get_in_dict
 
 logger = logging.getLogger(__name__)
 
@@ -14,13 +14,11 @@ logger = logging.getLogger(__name__)
 def update_aws(thread_id, service, interval, greedy=False):
     beanstalk_client = get_beanstalk_client(service['region_name'], service['access_key'], service['secret_key'])
     application_environment_mapping = get_beanstalk_environments(beanstalk_client)
+    results = list()
     for application, environment in application_environment_mapping.items():
         app_id = "aws::" + service["id"] + '/' + application
-
-        health = get_beanstalk_health(service, beanstalk_client, app_id, environment)
-
-        config.rdb.set(app_id, json.dumps(health))
-        config.rdb.sadd("all-services", app_id)
+        results.append((app_id, get_beanstalk_health(service, beanstalk_client, app_id, environment)))
+    save_tasks(results)
     if not greedy:
         logger.debug("Finish update for aws")
         Timer(interval=interval,
@@ -28,6 +26,15 @@ def update_aws(thread_id, service, interval, greedy=False):
               args=(thread_id, service, interval)).start()
 
 
+def save_tasks(results):
+    pipeline = config.rdb.pipeline()
+    for app_id, health in results:
+        pipeline.set(app_id, store.encode_task(health))
+        pipeline.sadd("all-services", app_id)
+    pipeline.execute()
+    snapshot.publish(results)
+
+
 def get_beanstalk_client(region_name, access_key, secret_key):
     return boto3.client(
         'elasticbeanstalk',
@@ -47,12 +54,20 @@ def get_beanstalk_environments(beanstalk_client):
 
 
 def get_beanstalk_health(service, beanstalk_client, app_id, environment_name):
-    response = beanstalk_client.describe_environment_health(
+    response = describe_environment_health(beanstalk_client, environment_name)
+    return get_service_info(service, create_task(service, app_id, environment_name, response))
+
+
+def describe_environment_health(beanstalk_client, environment_name):
+    return beanstalk_client.describe_environment_health(
         EnvironmentName=environment_name,
         AttributeNames=[
             'Status', 'Color', 'Causes', 'ApplicationMetrics', 'InstancesHealth', 'All', 'HealthStatus', 'RefreshedAt'
         ]
     )
+
+
+def create_task(service, app_id, environment_name, response):
     group, _, _, _, _ = util.itemize_app_id(app_id)
     vertical = environment_name.split('-')[0]
     name = environment_name.split('-')[1]
@@ -89,23 +104,17 @@ def get_beanstalk_health(service, beanstalk_client, app_id, environment_name):
     task["marathon"]["unhealthy"] = unhealthy
     task["marathon"]["marathon_link"] = ""
     task["marathon"]["labels"] = {}
-
-    task = get_service_info(task)
-
-    task["status"] = overall_status(task)
-    task["severity"] = util.calculate_severity(task)
     return task
 
 
-def get_service_info(task):
-    status_page_data, active_color, status_page_code = util.get_application_status(task["status_url"], {})
-    task["version"] = get_in_dict(["application", "version"], status_page_data, "UNKNOWN")
-    task["status_page_status_code"] = status_page_code
-    task["app_status"] = util.status_level(get_in_dict(["application", "status"], status_page_data, "UNKNOWN"))
-    task["jobs"] = dict()
-    for job, job_info in get_in_dict(["application", "statusDetails"], status_page_data, {}).items():
-        task["jobs"][job] = util.get_job_info(job_info)
+def get_service_info(service, task):
+    status_page_data, _, status_page_code = util.get_application_status(task["status_url"], service,
+                                                                        "aws::" + service["id"])
+    return set_status(task, status_page_data, status_page_code)
+
 
+def set_status(task, status_page_data, status_page_code):
+    util.set_status_page_info(task, status_page_data, status_page_code)
     task["status"] = overall_status(task)
     task["severity"] = util.calculate_severity(task)
     return task
@@ -1,7 +1,8 @@
 import json
 import pickle
 import re
-from threading import Timer
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Timer
 from urllib.parse import quote_plus
 from flask import logging
 
@@ -9,36 +10,22 @@ import requests
 from delorean import Delorean
 
 from app import config
+from app import snapshot
+from app import store
 from app.util import get_in_dict
+from app.modules import scheduler
+from app.modules import sessions
 from app.modules import util
 
 logger = logging.getLogger(__name__)
 
+executors = dict()
+executors_lock = Lock()
+apps_cache = dict()
 
-def update_marathon(thread_id, cfg, interval, greedy=False):
-    app_list = get_apps(cfg)
-    previous_tasks = (config.rdb.get(thread_id) or b'').decode().split(',')
-    blacklist = '(?:%s)' % '|'.join(cfg['blacklist']) if 'blacklist' in cfg else '1234'
-    tasks = list()
-    for app in app_list:
-        try:
-            _, _, _, app_name, _ = util.itemize_app_id(app["id"])
-            if not re.match(blacklist, app["id"]):
-                app_id = "marathon::" + app["id"]
-                config.rdb.sadd("all-services", app_id)
-                config.rdb.set(app_id, json.dumps(get_task_info(app, cfg)))
-                tasks.append(app_id)
-        except Exception as error:
-            logger.error(
-                ' '.join([cfg['host'] + ":" + (app["id"] if app else "unkown"), "[",
-                          error.__class__.__name__, "]"]), exc_info=True)
-
-    for app_id in list(set(previous_tasks) - set(tasks)):
-        config.rdb.delete(app_id)
-        config.rdb.srem("all-services", app_id)
-    config.rdb.set(thread_id, ",".join(tasks))
 
-    config.rdb.set(cfg['host'], pickle.dumps(Delorean.now()))
+def update_marathon(thread_id, cfg, interval, greedy=False):
+    save_tasks(thread_id, cfg, collect_tasks(cfg, get_apps(cfg)))
     if not greedy:
         logger.debug("Finish update for " + cfg['host'])
         Timer(interval=interval,
@@ -46,38 +33,184 @@ def update_marathon(thread_id, cfg, interval, greedy=False):
               args=(thread_id, cfg, interval)).start()
 
 
+def collect_tasks(cfg, app_list):
+    blacklist = get_blacklist(cfg)
+    return list(get_executor(cfg).map(lambda app: collect_task(app, cfg, blacklist), app_list))
+
+
+def save_tasks(thread_id, cfg, results, keep=()):
+    previous_tasks = (config.rdb.get(thread_id) or b'').decode().split(',')
+    tasks = [app_id for app_id in keep if app_id in previous_tasks]
+    changes = list()
+    pipeline = config.rdb.pipeline()
+    for app_id, task in results:
+        if task is not None:
+            pipeline.sadd("all-services", app_id)
+            pipeline.set(app_id, store.encode_task(task))
+            tasks.append(app_id)
+            changes.append((app_id, task))
+
+    for app_id in list(set(previous_tasks) - set(tasks)):
+        pipeline.delete(app_id)
+        pipeline.srem("all-services", app_id)
+        scheduler.forget(app_id)
+        changes.append((app_id, None))
+    pipeline.set(thread_id, ",".join(tasks))
+
+    pipeline.set(cfg['host'], pickle.dumps(Delorean.now()))
+    pipeline.execute()
+    snapshot.publish(changes)
+
+
+def save_task(thread_id, app_id, task):
+    tasks = [t for t in (config.rdb.get(thread_id) or b'').decode().split(',') if t]
+    pipeline = config.rdb.pipeline()
+    pipeline.sadd("all-services", app_id)
+    pipeline.set(app_id, store.encode_task(task))
+    if app_id not in tasks:
+        pipeline.set(thread_id, ",".join(tasks + [app_id]))
+    pipeline.execute()
+    snapshot.publish([(app_id, task)])
+
+
+def remove_task(thread_id, app_id):
+    tasks = [t for t in (config.rdb.get(thread_id) or b'').decode().split(',') if t]
+    pipeline = config.rdb.pipeline()
+    pipeline.delete(app_id)
+    pipeline.srem("all-services", app_id)
+    if app_id in tasks:
+        tasks.remove(app_id)
+        pipeline.set(thread_id, ",".join(tasks))
+    pipeline.execute()
+    snapshot.publish([(app_id, None)])
+    scheduler.forget(app_id)
+
+
+def get_blacklist(cfg):
+    return '(?:%s)' % '|'.join(cfg['blacklist']) if 'blacklist' in cfg else '1234'
+
+
+def get_executor(cfg):
+    with executors_lock:
+        if cfg['host'] not in executors:
+            executors[cfg['host']] = ThreadPoolExecutor(
+                max_workers=int(cfg.get('concurrency', config.DEFAULT_CONCURRENCY)))
+        return executors[cfg['host']]
+
+
+def collect_task(app, cfg, blacklist):
+    try:
+        app_id = get_app_id(app, blacklist)
+        if app_id:
+            return app_id, get_task_info(app, cfg)
+    except Exception as error:
+        log_app_error(cfg, app, error)
+    return None, None
+
+
+def get_app_id(app, blacklist):
+    util.itemize_app_id(app["id"])
+    if not re.match(blacklist, app["id"]):
+        return "marathon::" + app["id"]
+    return None
+
+
+def log_app_error(cfg, app, error):
+    logger.error(
+        ' '.join([cfg['host'] + ":" + (app["id"] if app else "unkown"), "[",
+                  error.__class__.__name__, "]"]), exc_info=True)
+
+
 def get_apps(marathon):
-    marathon_url = ''.join([marathon['protocol'],
-                            "://",
-                            quote_plus(marathon['username']),
-                            ':',
-                            quote_plus(marathon['password']),
-                            '@',
-                            marathon['host'],
-                            marathon['apps']])
     try:
-        request_result = requests.get(marathon_url,
-                                      headers={"Accept": "application/json"},
-                                      verify=False,
-                                      timeout=5)
-        data = json.loads(request_result.text)
-        config.rdb.set(marathon['host'] + '-cache', json.dumps(data["apps"]))
-        config.rdb.delete(marathon['host'] + '-errors')
+        session = sessions.get_session(marathon['host'], marathon)
+        request_result = session.get(get_apps_url(marathon),
+                                     headers=get_apps_headers(marathon),
+                                     verify=False,
+                                     timeout=5)
+        return read_apps(marathon, request_result.status_code, request_result.headers, request_result.text)
     except (ValueError, requests.exceptions.Timeout,
             requests.exceptions.ConnectionError) as error:
+        return read_apps_cache(marathon, error)
+
+
+def get_apps_url(marathon):
+    return get_marathon_url(marathon, marathon['apps'])
+
+
+def get_marathon_url(marathon, path):
+    return ''.join([marathon['protocol'],
+                    "://",
+                    quote_plus(marathon['username']),
+                    ':',
+                    quote_plus(marathon['password']),
+                    '@',
+                    marathon['host'],
+                    path])
 
-        error_message = ' '.join(["could not read marathon:", marathon['host'], "[", error.__class__.__name__, "]"])
 
-        logger.warning(error_message)
-        config.rdb.set(marathon['host'] + '-errors', error_message)
-        raw_cache = config.rdb.get(marathon['host'] + '-cache')
-        if raw_cache:
-            return json.loads(raw_cache.decode())
-        return []
+def get_apps_headers(marathon):
+    headers = {"Accept": "application/json"}
+    cached = apps_cache.get(marathon['host'])
+    if cached and cached['etag']:
+        headers["If-None-Match"] = cached['etag']
+    if cached and cached['last_modified']:
+        headers["If-Modified-Since"] = cached['last_modified']
+    return headers
+
+
+def read_apps(marathon, status_code, headers, text):
+    cached = apps_cache.get(marathon['host'])
+    if status_code == 304 and cached:
+        config.rdb.delete(marathon['host'] + '-errors')
+        return cached['apps']
+    data = json.loads(text)
+    apps_cache[marathon['host']] = {'etag': headers.get('ETag'),
+                                    'last_modified': headers.get('Last-Modified'),
+                                    'apps': data["apps"]}
+    config.rdb.set(marathon['host'] + '-cache', json.dumps(data["apps"]))
+    config.rdb.delete(marathon['host'] + '-errors')
     return data["apps"]
 
 
+def read_apps_cache(marathon, error):
+    error_message = ' '.join(["could not read marathon:", marathon['host'], "[", error.__class__.__name__, "]"])
+
+    logger.warning(error_message)
+    config.rdb.set(marathon['host'] + '-errors', error_message)
+    raw_cache = config.rdb.get(marathon['host'] + '-cache')
+    if raw_cache:
+        return json.loads(raw_cache.decode())
+    return []
+
+
 def get_task_info(app, cfg):
+    task, status_path = create_task(app, cfg)
+    if status_path and task["marathon"]["instances"] > 0:
+        key = "marathon::" + task["id"]
+        result = scheduler.get_result(key, task, cfg)
+        if result is not None:
+            return set_probe_result(task, result)
+        result = probe_status_page(task, cfg)
+        return scheduler.record(key, set_probe_result(task, result), cfg, result)
+    return set_status(task, {}, None, None)
+
+
+def probe_status_page(task, cfg):
+    status_url = task["status_url"]
+    status_page_data, active_color, status_page_code = util.get_application_status(status_url, cfg, cfg['host'])
+    if is_staged(task, active_color):
+        status_url = get_staged_url(status_url)
+        status_page_data, _, status_page_code = util.get_application_status(status_url, cfg, cfg['host'])
+    return status_url, status_page_data, active_color, status_page_code
+
+
+def set_probe_result(task, result):
+    task["status_url"], status_page_data, active_color, status_page_code = result
+    return set_status(task, status_page_data, active_color, status_page_code)
+
+
+def create_task(app, cfg):
     task = dict()
     task["id"] = app["id"]
     task["group"], task["vertical"], task["subgroup"], name, task["color"] = util.itemize_app_id(app["id"])
@@ -107,26 +240,20 @@ def get_task_info(app, cfg):
     task["status_url"] = get_status_url(name, task["group"], task["vertical"], task["subgroup"],
                                         cfg['base_domain'], status_path,
                                         root_app, cfg)
+    return task, status_path
+
+
+def is_staged(task, active_color):
+    return task["color"] and active_color and task["color"] != active_color
+
+
+def get_staged_url(status_url):
+    return status_url.replace('http://', 'http://staged.')
 
-    if status_path and task["marathon"]["instances"] > 0:
-        status_page_data, active_color, status_page_code = util.get_application_status(task["status_url"], cfg)
-        if task["color"] and active_color and task["color"] != active_color:
-            task["status_url"] = task["status_url"].replace('http://', 'http://staged.')
-            status_page_data, _, status_page_code = util.get_application_status(task["status_url"], cfg)
-        task["version"] = get_in_dict(["application", "version"], status_page_data, "UNKNOWN")
-        task["status_page_status_code"] = status_page_code
-        task["active_color"] = active_color
-        task["app_status"] = util.status_level(get_in_dict(["application", "status"], status_page_data, "UNKNOWN"))
-        task["jobs"] = dict()
-        for job, job_info in get_in_dict(["application", "statusDetails"], status_page_data, {}).items():
-            task["jobs"][job] = util.get_job_info(job_info)
-    else:
-        task["version"] = "UNKNOWN"
-        task["active_color"] = None
-        task["status_page_status_code"] = None
-        task["app_status"] = util.status_level("UNKNOWN")
-        task["jobs"] = dict()
 
+def set_status(task, status_page_data, active_color, status_page_code):
+    util.set_status_page_info(task, status_page_data, status_page_code)
+    task["active_color"] = active_color
     task["status"] = overall_status(task)
     task["severity"] = util.calculate_severity(task)
     return task
@@ -0,0 +1,231 @@
+import json
+from threading import Lock, Thread, Timer
+from flask import logging
+
+from app.modules import marathon
+from app.modules import sessions
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ["status_update_event",
+               "health_status_changed_event",
+               "failed_health_check_event",
+               "app_terminated_event",
+               "api_post_event",
+               "deployment_info",
+               "deployment_success",
+               "deployment_failed",
+               "deployment_step_success",
+               "deployment_step_failure"]
+
+known_apps = dict()
+generations = dict()
+pending = dict()
+active = dict()
+syncs = dict()
+locks = dict()
+locks_lock = Lock()
+
+
+def update_marathon(thread_id, cfg, interval, greedy=False):
+    if greedy:
+        return resync(thread_id, cfg)
+    Timer(interval=interval,
+          function=refresh_status_pages,
+          args=(thread_id, cfg, interval)).start()
+    watch(thread_id, cfg, interval)
+
+
+def watch(thread_id, cfg, interval):
+    try:
+        lines = open_stream(cfg, interval)
+        start_resync(thread_id, cfg, interval)
+        for event_type, event in read_events(lines):
+            handle_event(thread_id, cfg, event_type, event)
+    except Exception as error:
+        logger.warning(' '.join(["lost event stream of marathon:", cfg['host'], "[", error.__class__.__name__, "]"]))
+    finally:
+        Timer(interval=interval,
+              function=watch,
+              args=(thread_id, cfg, interval)).start()
+
+
+def start_resync(thread_id, cfg, interval):
+    token = object()
+    with get_lock(cfg):
+        syncs[cfg['host']] = token
+    Thread(target=sync,
+           args=(thread_id, cfg, interval, token),
+           name="resync-" + cfg['host'],
+           daemon=True).start()
+
+
+def sync(thread_id, cfg, interval, token):
+    try:
+        resync(thread_id, cfg, token)
+    except Exception as error:
+        logger.warning(' '.join(["could not resync marathon:", cfg['host'], "[", error.__class__.__name__, "]"]))
+        with get_lock(cfg):
+            retry = syncs.get(cfg['host']) is token
+        if retry:
+            Timer(interval=interval,
+                  function=sync,
+                  args=(thread_id, cfg, interval, token)).start()
+
+
+def resync(thread_id, cfg, token=None):
+    app_list = marathon.get_apps(cfg)
+    results = marathon.collect_tasks(cfg, app_list)
+    with get_lock(cfg):
+        if syncs.get(cfg['host']) is not token:
+            return
+        known_apps[cfg['host']] = {app["id"]: app for app in app_list}
+        generations[cfg['host']] = dict()
+        marathon.save_tasks(thread_id, cfg, results)
+        syncs.pop(cfg['host'], None)
+        host_active = active.setdefault(cfg['host'], set())
+        app_ids = [app_id for app_id in pending.get(cfg['host'], {}) if app_id not in host_active]
+        host_active.update(app_ids)
+    for app_id in app_ids:
+        marathon.get_executor(cfg).submit(apply_events, thread_id, cfg, app_id)
+    logger.debug("Resynchronized " + cfg['host'])
+
+
+def refresh_status_pages(thread_id, cfg, interval):
+    try:
+        with get_lock(cfg):
+            app_list = list(known_apps.get(cfg['host'], {}).values())
+            host_generations = generations.setdefault(cfg['host'], dict())
+            started = dict(host_generations)
+        results = marathon.collect_tasks(cfg, app_list)
+        with get_lock(cfg):
+            if generations.get(cfg['host']) is host_generations:
+                changed = {app_id for app_id, generation in host_generations.items()
+                           if started.get(app_id) != generation}
+                marathon.save_tasks(thread_id, cfg,
+                                    [result for app, result in zip(app_list, results) if app["id"] not in changed],
+                                    keep=["marathon::" + app_id for app_id in changed
+                                          if app_id in known_apps.get(cfg['host'], {})])
+        logger.debug("Finish status page update for " + cfg['host'])
+    except Exception as error:
+        logger.warning(' '.join(["could not refresh status pages of marathon:", cfg['host'], "[",
+                                 error.__class__.__name__, "]"]))
+    finally:
+        Timer(interval=interval,
+              function=refresh_status_pages,
+              args=(thread_id, cfg, interval)).start()
+
+
+def open_stream(cfg, interval):
+    session = sessions.get_session(cfg['host'], cfg)
+    response = session.get(marathon.get_marathon_url(cfg, "/v2/events"),
+                           params={"event_type": EVENT_TYPES},
+                           headers={"Accept": "text/event-stream"},
+                           verify=False,
+                           stream=True,
+                           timeout=(5, interval * 10))
+    response.raise_for_status()
+    return response.iter_lines(decode_unicode=True)
+
+
+def read_events(lines):
+    event_type = None
+    data = list()
+    for line in lines:
+        if not line:
+            if data:
+                try:
+                    event = json.loads('\n'.join(data))
+                    yield event.get("eventType", event_type), event
+                except ValueError as error:
+                    logger.warning(' '.join(["could not read marathon event:", str(event_type), "[",
+                                             error.__class__.__name__, "]"]))
+            event_type = None
+            data = list()
+        elif line.startswith("event:"):
+            event_type = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+
+
+def handle_event(thread_id, cfg, event_type, event):
+    for app_id in get_affected_apps(event):
+        with get_lock(cfg):
+            pending.setdefault(cfg['host'], dict())[app_id] = event_type
+            host_active = active.setdefault(cfg['host'], set())
+            if app_id in host_active or cfg['host'] in syncs:
+                continue
+            host_active.add(app_id)
+        marathon.get_executor(cfg).submit(apply_events, thread_id, cfg, app_id)
+
+
+def apply_events(thread_id, cfg, app_id):
+    while True:
+        with get_lock(cfg):
+            host_pending = pending.get(cfg['host'], {})
+            if app_id not in host_pending or cfg['host'] in syncs:
+                active.get(cfg['host'], set()).discard(app_id)
+                return
+            event_type = host_pending.pop(app_id)
+        try:
+            if event_type == "app_terminated_event":
+                remove_app(thread_id, cfg, app_id)
+            else:
+                update_app(thread_id, cfg, app_id)
+        except Exception as error:
+            logger.warning(' '.join(["could not update app:", cfg['host'] + ":" + app_id, "[",
+                                     error.__class__.__name__, "]"]))
+
+
+def get_affected_apps(event):
+    if "appId" in event:
+        return [event["appId"]]
+    if "appDefinition" in event:
+        return [event["appDefinition"]["id"]]
+    app_ids = set()
+    for step in event.get("plan", {}).get("steps", []):
+        for action in step.get("actions", []) if isinstance(step, dict) else step:
+            if "app" in action:
+                app_ids.add(action["app"])
+    return sorted(app_ids)
+
+
+def update_app(thread_id, cfg, app_id):
+    app = get_app(cfg, app_id)
+    if app is None:
+        return remove_app(thread_id, cfg, app_id)
+    task_id, task = marathon.collect_task(app, cfg, marathon.get_blacklist(cfg))
+    with get_lock(cfg):
+        known_apps.setdefault(cfg['host'], {})[app_id] = app
+        count_change(cfg, app_id)
+        if task is not None:
+            marathon.save_task(thread_id, task_id, task)
+
+
+def remove_app(thread_id, cfg, app_id):
+    with get_lock(cfg):
+        known_apps.get(cfg['host'], {}).pop(app_id, None)
+        count_change(cfg, app_id)
+        marathon.remove_task(thread_id, "marathon::" + app_id)
+
+
+def count_change(cfg, app_id):
+    host_generations = generations.setdefault(cfg['host'], dict())
+    host_generations[app_id] = host_generations.get(app_id, 0) + 1
+
+
+def get_app(cfg, app_id):
+    session = sessions.get_session(cfg['host'], cfg)
+    request_result = session.get(marathon.get_marathon_url(cfg, cfg['apps'] + app_id),
+                                 headers={"Accept": "application/json"},
+                                 verify=False,
+                                 timeout=5)
+    if request_result.status_code == 404:
+        return None
+    request_result.raise_for_status()
+    return request_result.json()["app"]
+
+
+def get_lock(cfg):
+    with locks_lock:
+        return locks.setdefault(cfg['host'], Lock())
@@ -0,0 +1,55 @@
+import time
+from threading import Lock
+
+from app import config
+
+schedule = dict()
+lock = Lock()
+
+
+def get_result(key, task, cfg, now=None):
+    now = time.time() if now is None else now
+    with lock:
+        entry = schedule.get(key)
+        if entry is None or now >= entry['next'] or entry['marathon'] != task.get("marathon"):
+            return None
+        return entry['result']
+
+
+def record(key, task, cfg, result, now=None):
+    now = time.time() if now is None else now
+    min_interval, max_interval = get_bounds(cfg)
+    if max_interval <= 0:
+        return task
+    state = get_state(task)
+    with lock:
+        entry = schedule.get(key)
+        if entry is None or entry['state'] != state or task["status"] > 0 or task["group"] == 'live':
+            interval = min_interval
+        else:
+            interval = min(max(entry['interval'], 1) * 2, max_interval)
+        schedule[key] = {'interval': interval,
+                         'next': now + interval,
+                         'state': state,
+                         'marathon': task.get("marathon"),
+                         'result': result}
+    return task
+
+
+def forget(key):
+    with lock:
+        schedule.pop(key, None)
+
+
+def get_bounds(cfg):
+    min_interval = float(cfg.get('min_probe_interval', config.DEFAULT_MIN_PROBE_INTERVAL))
+    max_interval = float(cfg.get('max_probe_interval', config.DEFAULT_MAX_PROBE_INTERVAL))
+    return min_interval, max(min_interval, max_interval)
+
+
+def get_state(task):
+    return (task.get("version"),
+            task.get("status_page_status_code"),
+            task.get("active_color"),
+            task.get("app_status"),
+            tuple(sorted((job, job_info["status"]) for job, job_info in task.get("jobs", {}).items())))
@@ -0,0 +1,95 @@
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from flask import logging
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+sessions = dict()
+settings = dict()
+counters = dict()
+lock = Lock()
+
+
+def get_session(name, cfg):
+    pool_settings = get_pool_settings(cfg)
+    with lock:
+        if name not in sessions:
+            sessions[name] = create_session(name, *pool_settings)
+            settings[name] = pool_settings
+            counters[name] = {'hits': 0, 'misses': 0}
+        elif settings[name] != pool_settings:
+            logger.warning(' '.join(["ignoring pool settings", str(pool_settings), "of session", name,
+                                     "created with", str(settings[name])]))
+        return sessions[name]
+
+
+def get_pool_settings(cfg):
+    return (int(cfg.get('pool_connections', config.DEFAULT_POOL_CONNECTIONS)),
+            int(cfg.get('pool_maxsize', config.DEFAULT_POOL_MAXSIZE)))
+
+
+def create_session(name, pool_connections, pool_maxsize):
+    adapter = CountingHTTPAdapter(name, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session = requests.Session()
+    session.cookies = StatelessCookieJar()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_counters():
+    with lock:
+        return {name: dict(counter) for name, counter in counters.items()}
+
+
+def count(name, reused):
+    with lock:
+        counters[name]['hits' if reused else 'misses'] += 1
+
+
+class StatelessCookieJar(RequestsCookieJar):
+    def extract_cookies(self, response, request):
+        pass
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    def __init__(self, name, **kwargs):
+        self.name = name
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self.poolmanager = CountingPoolManager(self.name, num_pools=connections, maxsize=maxsize, block=block,
+                                               **pool_kwargs)
+
+
+class CountingPoolManager(PoolManager):
+    def __init__(self, name, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.pool_classes_by_scheme = {'http': CountingHTTPConnectionPool,
+                                       'https': CountingHTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.name = self.name
+        return pool
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _make_request(self, conn, *args, **kwargs):
+        count(self.name, conn.sock is not None)
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _make_request(self, conn, *args, **kwargs):
+        count(self.name, conn.sock is not None)
+        return super()._make_request(conn, *args, **kwargs)
@@ -1,23 +1,19 @@
-import json
 import pickle
 from threading import Timer
 from delorean import Delorean
 from flask import logging
 
 from app import config
-
-from app.util import get_in_dict
+from app import snapshot
+from app import store
+from app.modules import scheduler
 from app.modules import util
 
 logger = logging.getLogger(__name__)
 
 
 def update_standalone(thread_id, service_list, interval, greedy=False):
-    for service in service_list:
-        service_id = "standalone::" + service["id"]
-        config.rdb.sadd("all-services", service_id)
-        config.rdb.set(service_id, json.dumps(get_service_info(service)))
-    config.rdb.set("standalone_services", pickle.dumps(Delorean.now()))
+    save_tasks([("standalone::" + service["id"], get_service_info(service)) for service in service_list])
     if not greedy:
         logger.debug("Finish update for services")
         Timer(interval=interval,
@@ -25,7 +21,36 @@ def update_standalone(thread_id, service_list, interval, greedy=False):
               args=(thread_id, service_list, interval)).start()
 
 
+def save_tasks(results):
+    pipeline = config.rdb.pipeline()
+    for service_id, task in results:
+        pipeline.sadd("all-services", service_id)
+        pipeline.set(service_id, store.encode_task(task))
+    pipeline.set("standalone_services", pickle.dumps(Delorean.now()))
+    pipeline.execute()
+    snapshot.publish(results)
+
+
 def get_service_info(service):
+    task = create_task(service)
+    key = "standalone::" + service["id"]
+    result = scheduler.get_result(key, task, service)
+    if result is not None:
+        return set_probe_result(task, result)
+    result = util.get_application_status(service["url"], service, "standalone", get_pool_cfg())
+    return scheduler.record(key, set_probe_result(task, result), service, result)
+
+
+def get_pool_cfg():
+    return config.config.get('standalone', {}) if config.config else {}
+
+
+def set_probe_result(task, result):
+    status_page_data, active_color, status_page_code = result
+    return set_status(task, status_page_data, active_color, status_page_code)
+
+
+def create_task(service):
     task = dict()
     task["id"] = service["id"]
     task["status_url"] = service["url"]
@@ -34,16 +59,12 @@ def get_service_info(service):
     task["name"] = "standalone::" + name
     full_name = "-".join([task["vertical"], name])
     task["full-name"] = "standalone::" + full_name
+    return task
 
-    status_page_data, active_color, status_page_code = util.get_application_status(service["url"], service)
-    task["version"] = get_in_dict(["application", "version"], status_page_data, "UNKNOWN")
-    task["status_page_status_code"] = status_page_code
-    task["active_color"] = active_color
-    task["app_status"] = util.status_level(get_in_dict(["application", "status"], status_page_data, "UNKNOWN"))
-    task["jobs"] = dict()
-    for job, job_info in get_in_dict(["application", "statusDetails"], status_page_data, {}).items():
-        task["jobs"][job] = util.get_job_info(job_info)
 
+def set_status(task, status_page_data, active_color, status_page_code):
+    util.set_status_page_info(task, status_page_data, status_page_code)
+    task["active_color"] = active_color
     task["status"] = task["app_status"]
     task["severity"] = util.calculate_severity(task)
     return task
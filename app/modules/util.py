@@ -1,18 +1,23 @@
 from flask import logging
 import json
 import requests
+from delorean import parse
+
+from app.modules import sessions
+from app.util import get_in_dict
 
 logger = logging.getLogger(__name__)
 
 
-def get_application_status(status_url, cfg):
+def get_application_status(status_url, cfg, source="default", pool_cfg=None):
     status_code = None
     try:
-        request_result = requests.get(status_url,
-                                      headers=cfg['headers'] if 'headers' in cfg else {},
-                                      cookies=cfg['cookies'] if 'cookies' in cfg else {},
-                                      verify=False,
-                                      timeout=5)
+        session = sessions.get_session(source, cfg if pool_cfg is None else pool_cfg)
+        request_result = session.get(status_url,
+                                     headers=cfg['headers'] if 'headers' in cfg else {},
+                                     cookies=cfg['cookies'] if 'cookies' in cfg else {},
+                                     verify=False,
+                                     timeout=5)
         active_color = request_result.headers.get('x-color', None)
         status_code = request_result.status_code
         status_page_data = json.loads(request_result.text)
@@ -23,6 +28,16 @@ def get_application_status(status_url, cfg):
     return status_page_data, active_color, status_code
 
 
+def set_status_page_info(task, status_page_data, status_page_code):
+    task["version"] = get_in_dict(["application", "version"], status_page_data, "UNKNOWN")
+    task["status_page_status_code"] = status_page_code
+    task["app_status"] = status_level(get_in_dict(["application", "status"], status_page_data, "UNKNOWN"))
+    task["jobs"] = dict()
+    for job, job_info in get_in_dict(["application", "statusDetails"], status_page_data, {}).items():
+        task["jobs"][job] = get_job_info(job_info)
+    return task
+
+
 def itemize_app_id(app_id):
     color_codes = ['BLU', 'GRN']
     split = app_id.split("/")
@@ -52,8 +67,18 @@ def get_job_info(job):
     return {"status": current_status,
             "message": job.get("message", ""),
             "running": bool("running" in job and job["running"]),
-            "started": job.get("started", None),
-            "stopped": job.get("stopped", None)}
+            "started": to_epoch(job.get("started", None)),
+            "stopped": to_epoch(job.get("stopped", None))}
+
+
+def to_epoch(timestamp):
+    if timestamp is None or isinstance(timestamp, (int, float)):
+        return timestamp
+    try:
+        return parse(timestamp, dayfirst=False, yearfirst=True).epoch
+    except (ValueError, OverflowError):
+        logger.warning(' '.join(["could not parse job timestamp:", str(timestamp)]))
+        return None
 
 
 def status_level(status):
@@ -0,0 +1,32 @@
+from threading import Lock
+
+from app import config
+from app.lru import LRUCache
+
+pages = LRUCache(config.PAGE_CACHE_SIZE)
+versions = {'current': None}
+lock = Lock()
+
+
+def get(version, key):
+    return pages.get((version, key))
+
+
+def put(version, key, page):
+    with lock:
+        if versions['current'] is not None and version < versions['current']:
+            return
+        if version != versions['current']:
+            pages.clear()
+            versions['current'] = version
+        pages.put((version, key), page)
+
+
+def clear():
+    with lock:
+        pages.reset()
+        versions['current'] = None
+
+
+def get_counters():
+    return pages.get_counters()
@@ -0,0 +1,59 @@
+from bisect import bisect_left, insort
+from threading import Lock
+
+contributions = dict()
+services = dict()
+rankings = dict()
+lock = Lock()
+
+
+def update(results):
+    with lock:
+        for app_id, task in results:
+            previous = contributions.pop(app_id, None)
+            if previous:
+                vertical, name, full_name, severity = previous
+                change(vertical, name, -severity, -1)
+                change("all", full_name, -severity, -1)
+            if task is not None:
+                contributions[app_id] = vertical, name, full_name, severity = get_contribution(task)
+                change(vertical, name, severity, 1)
+                change("all", full_name, severity, 1)
+
+
+def get_contribution(task):
+    return task.get("vertical", ""), task.get("name", ""), task.get("full-name", ""), task.get("severity") or 0
+
+
+def change(vertical, name, severity, apps):
+    vertical_services = services.setdefault(vertical, dict())
+    ranking = rankings.setdefault(vertical, list())
+    service = vertical_services.setdefault(name, [0, 0])
+    if service[0]:
+        del ranking[bisect_left(ranking, (-service[1], name))]
+    service[0] += apps
+    service[1] += severity
+    if service[0]:
+        insort(ranking, (-service[1], name))
+    else:
+        del vertical_services[name]
+        if not vertical_services:
+            del services[vertical]
+            del rankings[vertical]
+
+
+def get_rankings():
+    with lock:
+        return {vertical: [name for _, name in ranking] for vertical, ranking in rankings.items()}
+
+
+def top(vertical, n):
+    with lock:
+        return [(name, -severity) for severity, name in rankings.get(vertical, [])[:n]]
+
+
+def clear():
+    with lock:
+        contributions.clear()
+        services.clear()
+        rankings.clear()
@@ -0,0 +1,79 @@
+import json
+import time
+from threading import Lock
+
+import msgpack
+
+current = 'json'
+counters = {'encoded': 0, 'encodedBytes': 0, 'encodeSeconds': 0.0, 'decoded': 0, 'decodeSeconds': 0.0}
+lock = Lock()
+
+
+def encode_json(task):
+    return json.dumps(task).encode()
+
+
+def decode_json(raw):
+    return json.loads(raw.decode())
+
+
+def encode_msgpack(task):
+    return msgpack.packb(task, use_bin_type=True)
+
+
+def decode_msgpack(raw):
+    return msgpack.unpackb(raw, raw=False)
+
+
+serializers = {'json': (encode_json, decode_json),
+               'msgpack': (encode_msgpack, decode_msgpack)}
+
+
+def configure(name):
+    global current
+    if name not in serializers:
+        raise ValueError("unknown serializer: " + str(name))
+    current = name
+
+
+def dumps(task):
+    start = time.perf_counter()
+    raw = serializers[current][0](task)
+    count('encode', time.perf_counter() - start, len(raw))
+    return raw
+
+
+def loads(raw):
+    start = time.perf_counter()
+    task = get_decoder(raw)(raw)
+    count('decode', time.perf_counter() - start)
+    return task
+
+
+def get_decoder(raw):
+    if raw[:1] in (b'{', b'['):
+        return decode_json
+    return decode_msgpack
+
+
+def count(operation, seconds, size=0):
+    with lock:
+        if operation == 'encode':
+            counters['encoded'] += 1
+            counters['encodedBytes'] += size
+            counters['encodeSeconds'] += seconds
+        else:
+            counters['decoded'] += 1
+            counters['decodeSeconds'] += seconds
+
+
+def get_counters():
+    with lock:
+        return {'serializer': current,
+                'encoded': counters['encoded'],
+                'averageBytes': round(counters['encodedBytes'] / counters['encoded']) if counters['encoded'] else 0,
+                'averageEncodeMicroseconds': round(counters['encodeSeconds'] / counters['encoded'] * 10 ** 6, 1)
+                if counters['encoded'] else 0.0,
+                'decoded': counters['decoded'],
+                'averageDecodeMicroseconds': round(counters['decodeSeconds'] / counters['decoded'] * 10 ** 6, 1)
+                if counters['decoded'] else 0.0}
@@ -0,0 +1,46 @@
+import uuid
+from collections import namedtuple
+from threading import Lock
+
+from app import allocation
+from app import ranking
+from app import updates
+
+Snapshot = namedtuple('Snapshot', ['version', 'apps', 'indexes', 'rankings', 'vertical_resources', 'app_resources',
+                                   'tabs', 'errors'])
+
+instance = uuid.uuid4().hex
+version = 0
+current = None
+lock = Lock()
+build_lock = Lock()
+
+
+def publish(changes=()):
+    global version
+    allocation.update(changes)
+    ranking.update(changes)
+    with lock:
+        version += 1
+        published = version
+    updates.push(changes)
+    return published
+
+
+def get(build):
+    global current
+    snapshot = current
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with build_lock:
+        snapshot = current
+        published = version
+        if snapshot is None or snapshot.version != published:
+            snapshot = build(published)
+            if current is None or current.version < snapshot.version:
+                current = snapshot
+        return snapshot
+
+
+def get_version():
+    return version
@@ -4,31 +4,39 @@ import pickle
 import uuid
 from threading import Timer
 
-import redislite
 from delorean import Delorean
 from eliza.config import ConfigLoader
 from flask import Flask
 
-from app import config, status, styleguide, views, view_util
+from app import api, config, serializer, status, store, styleguide, views, view_util
+from app.modules import async_engine
 from app.modules import aws
 from app.modules import marathon
+from app.modules import marathon_events
 from app.modules import standalone
 
 logger = logging.getLogger(__name__)
 
+collectors = {'marathon': marathon.update_marathon,
+              'marathon_events': marathon_events.update_marathon,
+              'standalone': standalone.update_standalone,
+              'aws': aws.update_aws}
+
 
 def create_app(port, environment, working_dir, greedy_mode):
     flask = Flask(__name__)
     flask.config.from_pyfile('config.py')
 
     flask.jinja_env.filters['ceil'] = view_util.ceil
+    flask.jinja_env.globals['tile'] = view_util.tile
 
     config_loader = ConfigLoader(verify=False)
     config.info = config_loader.load_application_info("./")
     config.config = config_loader.load_config("resources/", environment, fill_with_defaults=True)
-    config.rdb = redislite.Redis(working_dir + 'redis.db')
+    config.rdb = store.create(config.config.get('store', 'redis'), working_dir)
     config.rdb.flushall()
     config.rdb.flushdb()
+    serializer.configure(config.config.get('serializer', 'json'))
 
     start_tasks(config.config, greedy_mode)
 
@@ -36,6 +44,7 @@ def create_app(port, environment, working_dir, greedy_mode):
 
     flask.register_blueprint(views.blueprint)
     flask.register_blueprint(styleguide.blueprint)
+    flask.register_blueprint(api.blueprint)
 
     return flask
 
@@ -56,27 +65,46 @@ def generate_id():
 
 
 def start_tasks(config_file, greedy_mode):
+    jobs = get_jobs(config_file)
+    if config_file.get('engine') == 'asyncio':
+        async_engine.start([(source, register_thread(thread_name), cfg) for source, thread_name, cfg in jobs
+                            if source in async_engine.collectors],
+                           config.THREAD_UPDATE_INTERVAL, greedy_mode)
+        jobs = [job for job in jobs if job[0] not in async_engine.collectors]
+    for source, thread_name, cfg in jobs:
+        start_thread_timer(thread_name, collectors[source], cfg, greedy_mode)
+
+
+def get_jobs(config_file):
+    jobs = list()
     if 'marathons' in config_file:
         for marathon_cfg in config_file['marathons']:
-            start_thread_timer(marathon_cfg['host'], marathon.update_marathon, marathon_cfg, greedy_mode)
+            source = 'marathon_events' if marathon_cfg.get('mode') == 'events' else 'marathon'
+            jobs.append((source, marathon_cfg['host'], marathon_cfg))
     if 'services' in config_file:
         service_list = list()
         for service in config_file['services']:
             if '{environment}' in service['id']:
                 for env in config_file['environments']:
-                    service_list.append({'id': service['id'].replace('{environment}', env['name']),
-                                         'url': service['url'].replace('{environment}', env['name'])})
+                    service_list.append(dict(service,
+                                             id=service['id'].replace('{environment}', env['name']),
+                                             url=service['url'].replace('{environment}', env['name'])))
             else:
-                service_list.append({'id': service['id'], 'url': service['url']})
-        start_thread_timer("standalone_services", standalone.update_standalone, service_list, greedy_mode)
+                service_list.append(dict(service))
+        jobs.append(('standalone', "standalone_services", service_list))
     if 'aws' in config_file:
         for service in config_file['aws']:
-            start_thread_timer(service['id'], aws.update_aws, service, greedy_mode)
+            jobs.append(('aws', service['id'], service))
+    return jobs
 
 
-def start_thread_timer(thread_name, func, cfg, greedy_mode):
+def register_thread(thread_name):
     thread_id = generate_id()
     config.rdb.lpush('thread-list', thread_name)
     config.rdb.set(thread_id + config.THREAD_SUFFIX, pickle.dumps(Delorean.now()))
+    return thread_id
+
+
+def start_thread_timer(thread_name, func, cfg, greedy_mode):
     Timer(interval=1, function=func,
-          args=(thread_id, cfg, config.THREAD_UPDATE_INTERVAL, greedy_mode)).start()
+          args=(register_thread(thread_name), cfg, config.THREAD_UPDATE_INTERVAL, greedy_mode)).start()
@@ -0,0 +1,29 @@
+window.o_p13n = window.o_p13n || {};
+window.o_p13n.tools = window.o_p13n.tools || {};
+
+o_p13n.tools.lazy_tabs = function () {
+    "use strict";
+    var module = {};
+
+    module.load = function ($pane) {
+        var url = $pane.attr('data-fragment');
+        if (!url) {
+            return null;
+        }
+        $pane.removeAttr('data-fragment');
+        return $.get(url).done(function (html) {
+            $pane.removeClass('js-lazy-tab').html(html);
+        }).fail(function () {
+            $pane.attr('data-fragment', url);
+        });
+    };
+
+    module.init = function () {
+        $('a[data-toggle="tab"]').on('show.bs.tab', function () {
+            module.load($($(this).attr('href')));
+        });
+    };
+
+    return module
+
+};
@@ -0,0 +1,99 @@
+window.o_p13n = window.o_p13n || {};
+window.o_p13n.tools = window.o_p13n.tools || {};
+
+o_p13n.tools.live_updates = function () {
+    "use strict";
+    var module = {};
+
+    var wellClasses = ['well-unknown', 'well-warning', 'well-danger'];
+    var statusLabels = [['label-success', 'OK'],
+                        ['label-default', 'UNKNOWN'],
+                        ['label-warning', 'WARNING'],
+                        ['label-danger', 'ERROR']];
+    var dotClasses = ['health-dot-success', 'health-dot-unknown', 'health-dot-warning', 'health-dot-danger'];
+
+    var level = function (status) {
+        return status === 0 || status === 1 || status === 2 ? status : 3;
+    };
+
+    var findByAttr = function ($root, attr, value) {
+        return $root.find('[' + attr + ']').filter(function () {
+            return $(this).attr(attr) === value;
+        });
+    };
+
+    var patchInstances = function ($tile, marathon) {
+        var $instances = $tile.find('.js-instances');
+        $instances.removeClass('text-danger text-primary text-success');
+        if (marathon.healthy < marathon.instances) {
+            $instances.addClass('text-danger').text(marathon.healthy + '/' + marathon.instances);
+        } else if (marathon.instances === 0) {
+            $instances.addClass('text-primary').text('suspended');
+        } else {
+            $instances.addClass('text-success').text(marathon.healthy + '/' + marathon.instances);
+        }
+
+        $tile.find('.js-staged, .js-unhealthy').remove();
+        var $last = $instances;
+        if (marathon.staged > 0) {
+            var $staged = $('<small class="label label-warning black-text js-staged"></small>')
+                .text('Staged: ' + marathon.staged);
+            $last.after(' ', $staged);
+            $last = $staged;
+        }
+        if (marathon.unhealthy > 0) {
+            $last.after(' ', $('<small class="label label-danger black-text js-unhealthy"></small>')
+                .text('Unhealthy: ' + marathon.unhealthy));
+        }
+    };
+
+    var patchTile = function ($tile, delta) {
+        $tile.removeClass(wellClasses.join(' '));
+        if (delta.status >= 1) {
+            $tile.addClass(wellClasses[level(delta.status) - 1]);
+        }
+        $tile.attr('data-severity', delta.severity);
+
+        var label = statusLabels[level(delta.app_status)];
+        $tile.find('.js-app-status')
+            .removeClass($.map(statusLabels, function (l) { return l[0]; }).join(' '))
+            .addClass(label[0])
+            .text(label[1]);
+
+        if (delta.marathon) {
+            patchInstances($tile, delta.marathon);
+        }
+
+        $.each(delta.jobs, function (job, info) {
+            findByAttr($tile, 'data-job', job)
+                .removeClass(dotClasses.join(' '))
+                .addClass(dotClasses[level(info.status)])
+                .toggleClass('glowing', !!info.running);
+        });
+    };
+
+    module.patch = function (delta) {
+        var $tiles = findByAttr($(document), 'data-app', delta.id);
+        if (delta.removed) {
+            $tiles.remove();
+        } else {
+            $tiles.each(function () {
+                patchTile($(this), delta);
+            });
+        }
+    };
+
+    module.connect = function (url) {
+        if (!window.EventSource) {
+            return null;
+        }
+        var source = new EventSource(url);
+        source.addEventListener('app', function (event) {
+            module.patch(JSON.parse(event.data));
+        });
+        return source;
+    };
+
+    return module
+
+};
@@ -3,7 +3,10 @@ import pickle
 import socket
 
 from app import config
+from app import page_cache
+from app import serializer
 from app import view_util
+from app.modules import sessions
 import version
 from delorean import Delorean
 from flask import Response, render_template, request, jsonify, Blueprint
@@ -68,7 +71,10 @@ def generate_status():
             "contact_business": blueprint.info['contact_business']
         },
         "serviceSpecs": {
-
+            "connectionPools": sessions.get_counters(),
+            "pageCache": page_cache.get_counters(),
+            "tileCache": view_util.tiles.get_counters(),
+            "taskSerializer": serializer.get_counters()
         }
     }
 
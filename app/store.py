@@ -0,0 +1,135 @@
+from threading import RLock
+
+import redislite
+
+from app import config
+from app import serializer
+
+PIPELINE_COMMANDS = ('get', 'mget', 'set', 'delete', 'sadd', 'srem', 'smembers', 'lpush', 'lrange')
+
+
+class MemoryStore(object):
+    keeps_objects = True
+
+    def __init__(self):
+        self.lock = RLock()
+        self.data = dict()
+
+    def get(self, key):
+        with self.lock:
+            return self.data.get(to_key(key))
+
+    def mget(self, keys):
+        with self.lock:
+            return [self.data.get(to_key(key)) for key in keys]
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[to_key(key)] = to_value(value)
+            return True
+
+    def delete(self, *keys):
+        with self.lock:
+            return sum(1 for key in keys if self.data.pop(to_key(key), None) is not None)
+
+    def sadd(self, key, *members):
+        with self.lock:
+            members = {to_value(member) for member in members}
+            current = self.data.setdefault(to_key(key), set())
+            added = len(members - current)
+            current |= members
+            return added
+
+    def srem(self, key, *members):
+        with self.lock:
+            current = self.data.get(to_key(key), set())
+            members = {to_value(member) for member in members}
+            removed = len(members & current)
+            current -= members
+            if not current:
+                self.data.pop(to_key(key), None)
+            return removed
+
+    def smembers(self, key):
+        with self.lock:
+            return set(self.data.get(to_key(key), set()))
+
+    def lpush(self, key, *values):
+        with self.lock:
+            current = self.data.setdefault(to_key(key), list())
+            for value in values:
+                current.insert(0, to_value(value))
+            return len(current)
+
+    def lrange(self, key, start, end):
+        with self.lock:
+            current = self.data.get(to_key(key), list())
+            return current[start:len(current) + end + 1 if end < 0 else end + 1]
+
+    def flushall(self):
+        with self.lock:
+            self.data.clear()
+            return True
+
+    def flushdb(self):
+        return self.flushall()
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline(object):
+    def __init__(self, store):
+        self.store = store
+        self.commands = list()
+
+    def __getattr__(self, name):
+        if name not in PIPELINE_COMMANDS:
+            raise AttributeError(name)
+        command = getattr(self.store, name)
+
+        def queue(*args):
+            self.commands.append((command, args))
+            return self
+
+        return queue
+
+    def execute(self):
+        with self.store.lock:
+            results = [command(*args) for command, args in self.commands]
+        self.commands = list()
+        return results
+
+
+stores = {'redis': lambda working_dir: redislite.Redis(working_dir + 'redis.db'),
+          'memory': lambda working_dir: MemoryStore()}
+
+
+def create(name, working_dir):
+    if name not in stores:
+        raise ValueError("unknown store: " + str(name))
+    return stores[name](working_dir)
+
+
+def to_key(key):
+    return key.decode() if isinstance(key, bytes) else str(key)
+
+
+def to_value(value):
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, (str, int, float)):
+        return str(value).encode()
+    return value
+
+
+def encode_task(task):
+    if getattr(config.rdb, 'keeps_objects', False):
+        return task
+    return serializer.dumps(task)
+
+
+def decode_task(raw):
+    if isinstance(raw, bytes):
+        return serializer.loads(raw)
+    return raw
@@ -1,39 +1,157 @@
-class Task:
-    def __init__(self):
-        self.id = None
-        self.group = None
-        self.vertical = None
-        self.name = None
-        self.color = None
-        self.subgroup = None
-        self.active_color = None
-        self.status = None
-        self.app_status = None
-        self.status_url = None
-        self.status_page_status_code = None
-        self.version = None
-        self.jobs = []
-        self.marathon = Marathon()
-
-
-class Marathon:
-    def __init__(self):
-        self.origin = None
-        self.instances = None
-        self.cpu = None
-        self.mem = None
-        self.staged = None
-        self.running = None
-        self.healthy = None
-        self.unhealthy = None
-        self.marathon_link = None
-
-
-class Job:
-    def __init__(self, name=None, message=None, status=None, stopped=None, started=None, running=None):
-        self.name = name
-        self.message = message
-        self.status = status
-        self.stopped = stopped
-        self.started = started
-        self.running = running
+from collections.abc import Mapping
+from types import MappingProxyType
+
+SCALARS = {str, int, float, bool, type(None)}
+
+
+class Record(Mapping):
+    __slots__ = ('_frozen',)
+    fields = ()
+    attributes = {}
+
+    def __init__(self, **values):
+        for attribute, value in values.items():
+            object.__setattr__(self, attribute, value)
+
+    @classmethod
+    def from_wire(cls, data):
+        record = cls.__new__(cls)
+        for key, attribute in cls.fields:
+            if key in data:
+                object.__setattr__(record, attribute, cls.decode(key, data[key]))
+        return record
+
+    @classmethod
+    def decode(cls, key, value):
+        return value
+
+    def to_wire(self):
+        data = dict()
+        for key, attribute in self.fields:
+            try:
+                value = getattr(self, attribute)
+            except AttributeError:
+                continue
+            data[key] = value.to_wire() if isinstance(value, Record) else \
+                {name: job.to_wire() for name, job in value.items()} if key == "jobs" else \
+                dict(value) if isinstance(value, MappingProxyType) else value
+        return data
+
+    def replace(self, **changes):
+        record = self.__class__.__new__(self.__class__)
+        for _, attribute in self.fields:
+            try:
+                object.__setattr__(record, attribute,
+                                   changes[attribute] if attribute in changes else getattr(self, attribute))
+            except AttributeError:
+                pass
+        return record
+
+    def freeze(self):
+        try:
+            return self._frozen
+        except AttributeError:
+            pass
+        frozen = list()
+        for key, attribute in self.fields:
+            try:
+                value = getattr(self, attribute)
+            except AttributeError:
+                continue
+            frozen.append((key, value if value.__class__ in SCALARS else freeze(value)))
+        frozen = tuple(frozen)
+        object.__setattr__(self, '_frozen', frozen)
+        return frozen
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError(self.__class__.__name__ + " is immutable")
+
+    def __delattr__(self, attribute):
+        raise AttributeError(self.__class__.__name__ + " is immutable")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.attributes[key])
+        except AttributeError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key, attribute in self.fields:
+            if hasattr(self, attribute):
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return self.__class__.__name__ + '(' + repr(self.to_wire()) + ')'
+
+
+class Task(Record):
+    fields = (("id", "id"),
+              ("group", "group"),
+              ("vertical", "vertical"),
+              ("name", "name"),
+              ("full-name", "full_name"),
+              ("color", "color"),
+              ("subgroup", "subgroup"),
+              ("active_color", "active_color"),
+              ("status", "status"),
+              ("severity", "severity"),
+              ("app_status", "app_status"),
+              ("status_url", "status_url"),
+              ("status_page_status_code", "status_page_status_code"),
+              ("version", "version"),
+              ("jobs", "jobs"),
+              ("marathon", "marathon"))
+    attributes = dict(fields)
+    __slots__ = tuple(attribute for _, attribute in fields)
+
+    @classmethod
+    def decode(cls, key, value):
+        if key == "marathon":
+            return Marathon.from_wire(value)
+        if key == "jobs":
+            return MappingProxyType({name: Job.from_wire(job) for name, job in value.items()})
+        return value
+
+
+class Marathon(Record):
+    fields = tuple((field, field) for field in ["origin", "instances", "healthy", "unhealthy", "running", "staged",
+                                                "cpu", "mem", "marathon_link", "labels"])
+    attributes = dict(fields)
+    __slots__ = tuple(attribute for _, attribute in fields)
+
+    @classmethod
+    def decode(cls, key, value):
+        if key == "labels":
+            return MappingProxyType(dict(value))
+        return value
+
+
+class Job(Record):
+    fields = tuple((field, field) for field in ["status", "message", "running", "started", "stopped", "age"])
+    attributes = dict(fields)
+    __slots__ = tuple(attribute for _, attribute in fields)
+
+
+def freeze(value):
+    if isinstance(value, Record):
+        return value.freeze()
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, item if item.__class__ in SCALARS else freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def as_task(app):
+    return app if isinstance(app, Task) else Task.from_wire(app)
+
+
+def to_wire(record):
+    if isinstance(record, Record):
+        return record.to_wire()
+    if isinstance(record, Mapping):
+        return {key: to_wire(value) if isinstance(value, Mapping) else value for key, value in record.items()}
+    raise TypeError(repr(record) + " is not JSON serializable")
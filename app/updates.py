@@ -0,0 +1,74 @@
+import json
+import queue
+from threading import Lock
+
+KEEPALIVE_INTERVAL = 15
+QUEUE_SIZE = 1000
+
+digests = dict()
+subscribers = set()
+lock = Lock()
+
+
+def push(results):
+    deltas = list()
+    with lock:
+        for app_id, task in results:
+            if task is None:
+                if app_id in digests:
+                    deltas.append({"id": digests.pop(app_id)["id"], "removed": True})
+                continue
+            delta = get_delta(task)
+            if digests.get(app_id) != delta:
+                digests[app_id] = delta
+                deltas.append(delta)
+        for subscriber in list(subscribers):
+            try:
+                for delta in deltas:
+                    subscriber.put_nowait(delta)
+            except queue.Full:
+                subscribers.discard(subscriber)
+    return deltas
+
+
+def get_delta(task):
+    delta = {"id": get_tile_id(task),
+             "status": task.get("status"),
+             "severity": task.get("severity"),
+             "app_status": task.get("app_status"),
+             "jobs": {job: {"status": job_info.get("status"), "running": job_info.get("running")}
+                      for job, job_info in task.get("jobs", {}).items()}}
+    if "marathon" in task:
+        delta["marathon"] = {field: task["marathon"].get(field)
+                             for field in ["instances", "healthy", "unhealthy", "running", "staged"]}
+    return delta
+
+
+def get_tile_id(task):
+    return task.get("name", "").split("::")[0] + "::" + str(task.get("id"))
+
+
+def subscribe():
+    subscriber = queue.Queue(maxsize=QUEUE_SIZE)
+    with lock:
+        subscribers.add(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber):
+    with lock:
+        subscribers.discard(subscriber)
+
+
+def stream(subscriber, keepalive=KEEPALIVE_INTERVAL):
+    try:
+        yield "retry: 5000\n\n"
+        while subscriber in subscribers:
+            try:
+                delta = subscriber.get(timeout=keepalive)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield "event: app\ndata: " + json.dumps(delta) + "\n\n"
+    finally:
+        unsubscribe(subscriber)
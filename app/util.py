@@ -1,13 +1,14 @@
-import json
+from collections.abc import Mapping
 
 from app import config
+from app import store
 from functools import reduce
 
 
 def load_app(app_id):
     raw_app = config.rdb.get(app_id)
     if raw_app:
-        return json.loads(raw_app.decode())
+        return store.decode_task(raw_app)
     return None
 
 
@@ -18,7 +19,7 @@ def get_by_list(dic, keys):
 def get_in_dict(key_list, my_dict, default=None):
     tmp = my_dict
     for key in key_list:
-        if not isinstance(tmp, dict):
+        if not isinstance(tmp, Mapping):
             return default
         tmp = tmp.get(key, default)
     return tmp
\ No newline at end of file
@@ -1,7 +1,13 @@
-from flask import render_template, request
+from flask import Markup, current_app, render_template, request
 
+from app.config import STREAM_BUFFER_SIZE
+from app.config import TILE_CACHE_SIZE
 from app.config import app_name
 from app.config import navigation_bar
+from app.lru import LRUCache
+from app.task import freeze
+
+tiles = LRUCache(TILE_CACHE_SIZE)
 
 
 def ceil(value):
@@ -9,13 +15,36 @@ def ceil(value):
 
 
 def render(html, title, **kwargs):
-    return render_template(html,
-                           parameter=request.args,
-                           url_query=get_url_query(),
-                           navigation_bar=navigation_bar,
-                           title=title,
-                           app_name=app_name,
-                           **kwargs)
+    return render_template(html, **get_context(title, kwargs))
+
+
+def stream(html, title, **kwargs):
+    context = get_context(title, kwargs)
+    current_app.update_template_context(context)
+    chunks = current_app.jinja_env.get_template(html).stream(context)
+    chunks.enable_buffering(STREAM_BUFFER_SIZE)
+    return chunks
+
+
+def tile(app, color, vertical, cinema_mode):
+    key = (freeze(app), color, str(vertical), bool(cinema_mode))
+    html = tiles.get(key)
+    if html is None:
+        html = Markup(current_app.jinja_env.get_template("app_tile.html").render(app=app,
+                                                                                color=color,
+                                                                                vertical=vertical,
+                                                                                cinema_mode=cinema_mode))
+        tiles.put(key, html)
+    return html
+
+
+def get_context(title, kwargs):
+    return dict(kwargs,
+                parameter=request.args,
+                url_query=get_url_query(),
+                navigation_bar=navigation_bar,
+                title=title,
+                app_name=app_name)
 
 
 def get_url_query():
@@ -25,6 +54,10 @@ def get_url_query():
         return ''
 
 
+def get_normalized_query():
+    return tuple(sorted(request.args.items(multi=True)))
+
+
 def request_wants_json():
     for mime in request.accept_mimetypes:
         if 'json' in mime[0]:
@@ -1,34 +1,52 @@
+import hashlib
 import json
 import logging
-from delorean import Delorean, parse
-from dotmap import DotMap
-from flask import request, url_for, jsonify, Blueprint, redirect
+import time
+from collections import defaultdict
+from types import MappingProxyType
+from flask import request, url_for, jsonify, Blueprint, redirect, Response, abort, stream_with_context
 
+from app import allocation
 from app import config
+from app import page_cache
+from app import ranking
+from app import snapshot
+from app import store
+from app import updates
 from app import view_util
+from app.task import Task, as_task, to_wire
 from app.util import get_in_dict
 
 logger = logging.getLogger('views')
 
 blueprint = Blueprint('views', __name__)
 
+AGE_UNITS = [("second", 1, 60),
+             ("minute", 60, 60 * 60),
+             ("hour", 60 * 60, 24 * 60 * 60),
+             ("day", 24 * 60 * 60, 30 * 24 * 60 * 60),
+             ("month", 30 * 24 * 60 * 60, 365 * 24 * 60 * 60),
+             ("year", 365 * 24 * 60 * 60, None)]
+
 
 def get_all_apps():
-    apps = config.rdb.smembers("all-services") or []
+    apps = list(config.rdb.smembers("all-services") or [])
     app_list = list()
-    for app in apps:
-        raw_app = config.rdb.get(app)
+    for raw_app in config.rdb.mget(apps) if apps else []:
         if raw_app:
-            app_list.append(json.loads(raw_app.decode()))
+            app_list.append(store.decode_task(raw_app))
     return app_list
 
 
 def get_error_messages(app_list):
+    origins = sorted({app['marathon']['origin'] for app in app_list if "marathon" in app})
+    raw_error_messages = dict(zip(origins, config.rdb.mget([origin + '-errors' for origin in origins])
+                                  if origins else []))
     errors = dict()
     errors['all'] = set()
     for app in app_list:
         if "marathon" in app:
-            raw_error_message = config.rdb.get(app['marathon']['origin'] + '-errors')
+            raw_error_message = raw_error_messages[app['marathon']['origin']]
             if raw_error_message:
                 if not app['vertical'] in errors:
                     errors[app['vertical']] = set()
@@ -46,54 +64,96 @@ def get_filter_lists(l):
 
 
 def filter_state(app_list, name_filter, group_filter, type_filter, active_color_only_filter, status_filter,
-                 include_jobs, include_age, env_filter):
-    if name_filter:
-        include_names, exclude_names = get_filter_lists(name_filter)
-    if group_filter:
-        include_groups, exclude_groups = get_filter_lists(group_filter)
-    if type_filter:
-        include_types, exclude_types = get_filter_lists(type_filter)
-    if env_filter:
-        include_envs, exclude_envs = get_filter_lists(env_filter)
+                 include_jobs, include_age, env_filter, indexes=None):
+    if indexes is None:
+        indexes = build_indexes(app_list)
+    includes, excludes = list(), list()
+    for dimension, values in [('name', name_filter), ('group', env_filter), ('vertical', group_filter),
+                              ('type', type_filter)]:
+        if values:
+            include, exclude = get_filter_lists(values)
+            if include:
+                includes.append(set().union(*[indexes[dimension].get(value, ()) for value in include]))
+            else:
+                excludes.extend(indexes[dimension].get(value, ()) for value in exclude)
+    if active_color_only_filter:
+        includes.append(indexes['active_color'])
+    if any(status < status_filter for status in indexes['status']):
+        includes.append(set().union(*[apps for status, apps in indexes['status'].items() if status >= status_filter]))
+    positions = select(app_list, includes, excludes)
+
+    now = time.time()
     filtered_list = list()
-    for app in app_list:
-        if not name_filter or filter(app['name'].split('::')[1], include=include_names, exclude=exclude_names):
-            if not env_filter or filter(app['group'], include=include_envs, exclude=exclude_envs):
-                if not group_filter or filter(app['vertical'], include=include_groups, exclude=exclude_groups):
-                    if not type_filter or filter(get_in_dict(["marathon", "labels", "type"], app, ""),
-                                                 include=include_types,
-                                                 exclude=exclude_types):
-                        if not active_color_only_filter or not app["active_color"] \
-                                or app["color"] == app["active_color"]:
-                            if app["status"] >= status_filter:
-                                if include_jobs:
-                                    filtered_jobs = dict()
-                                    for job_name, job_info in app["jobs"].items():
-                                        if job_info['status'] >= status_filter:
-                                            if job_info['status'] >= 1 and include_age and job_info.get('stopped',
-                                                                                                        False):
-                                                job_info["age"] = get_humanize_age(job_info)
-                                            filtered_jobs[job_name] = job_info
-                                    app["jobs"] = filtered_jobs
-                                else:
-                                    app["jobs"] = dict()
-                                filtered_list.append(app)
+    for position in sorted(positions):
+        app = as_task(app_list[position])
+        jobs = app.get("jobs", {})
+        filtered_jobs = dict()
+        unchanged = True
+        if include_jobs:
+            for job_name, job_info in jobs.items():
+                if job_info['status'] >= status_filter:
+                    if job_info['status'] >= 1 and include_age and job_info.get('stopped') is not None:
+                        job_info = job_info.replace(age=format_age(now - job_info['stopped']))
+                        unchanged = False
+                    filtered_jobs[job_name] = job_info
+        if unchanged and len(filtered_jobs) == len(jobs):
+            filtered_list.append(app)
+        else:
+            filtered_list.append(app.replace(jobs=MappingProxyType(filtered_jobs)))
     return filtered_list
 
 
-def get_humanize_age(job):
-    if job:
-        now = Delorean.now()
-        return (now - (now - parse(job['stopped'], dayfirst=False, yearfirst=True))).humanize()
-    return ""
+def build_indexes(app_list):
+    indexes = {'name': defaultdict(set),
+               'group': defaultdict(set),
+               'vertical': defaultdict(set),
+               'type': defaultdict(set),
+               'status': defaultdict(set),
+               'active_color': set()}
+    for position, app in enumerate(app_list):
+        indexes['name'][app['name'].split('::')[1]].add(position)
+        indexes['group'][app['group']].add(position)
+        indexes['vertical'][app['vertical']].add(position)
+        indexes['type'][get_in_dict(["marathon", "labels", "type"], app, "")].add(position)
+        indexes['status'][app['status']].add(position)
+        if not app["active_color"] or app["color"] == app["active_color"]:
+            indexes['active_color'].add(position)
+    return {dimension: frozenset(index) if isinstance(index, set)
+            else {value: frozenset(positions) for value, positions in index.items()}
+            for dimension, index in indexes.items()}
+
+
+def select(app_list, includes, excludes):
+    if not includes:
+        positions = set(range(len(app_list)))
+    else:
+        includes = sorted(includes, key=len)
+        positions = set(includes[0])
+        for include in includes[1:]:
+            positions &= include
+    for exclude in excludes:
+        positions = positions - exclude
+    return positions
+
+
+def format_age(seconds):
+    seconds = int(seconds)
+    if seconds <= 0:
+        return "now"
+    for unit, length, limit in AGE_UNITS:
+        if limit is None or seconds < limit:
+            count = seconds // length
+            return str(count) + " " + unit + ("" if count == 1 else "s") + " ago"
 
 
 def transform_to_display_data(apps):
-    display_data = DotMap()
+    display_data = dict()
     for app in apps:
-        display_data["all"][app["full-name"]][app["group"]][app["color"]] = app
-        display_data[app["vertical"]][app["name"]][app["group"]][app["color"]] = app
-    return display_data.toDict()
+        display_data.setdefault("all", {}).setdefault(app["full-name"], {}).setdefault(app["group"], {})[
+            app["color"]] = app
+        display_data.setdefault(app["vertical"], {}).setdefault(app["name"], {}).setdefault(app["group"], {})[
+            app["color"]] = app
+    return display_data
 
 
 def list_services_by_severity(transformed_data):
@@ -108,6 +168,17 @@ def list_services_by_severity(transformed_data):
     return sorted_services
 
 
+def get_services_by_severity(transformed_data, rankings, whole_services):
+    if not whole_services:
+        return list_services_by_severity(transformed_data)
+    services_by_severity = dict()
+    for vertical, services in transformed_data.items():
+        ranked = [service_name for service_name in rankings.get(vertical, []) if service_name in services]
+        services_by_severity[vertical] = ranked if len(ranked) == len(services) \
+            else list_services_by_severity({vertical: services})[vertical]
+    return services_by_severity
+
+
 def sum_severity_per_service(service):
     service_severity = 0
     for group_name, group in service.items():
@@ -117,8 +188,8 @@ def sum_severity_per_service(service):
 
 
 def get_app_resource_allocation(tasks):
-    app_resources = DotMap()
-    vertical_resources = DotMap()
+    app_resources = dict()
+    vertical_resources = dict()
 
     for task in tasks:
         if "marathon" in task:
@@ -133,24 +204,18 @@ def get_app_resource_allocation(tasks):
                 add_to(app_resources, task["vertical"], task["name"], task["full-name"], field, 0)
                 add_to(vertical_resources, task["vertical"], None, None, field, 0)
 
-    return vertical_resources.toDict(), app_resources.toDict()
+    return vertical_resources, app_resources
 
 
-def add_to(dotmap, vertical, name, full_name, field, value):
+def add_to(resources, vertical, name, full_name, field, value):
     if name:
-        if not dotmap[vertical][name][field]:
-            dotmap[vertical][name][field] = 0
-        if not dotmap["all"][full_name][field]:
-            dotmap["all"][full_name][field] = 0
-        dotmap[vertical][name][field] += value
-        dotmap["all"][full_name][field] += value
+        totals = [resources.setdefault(vertical, {}).setdefault(name, {}),
+                  resources.setdefault("all", {}).setdefault(full_name, {})]
     else:
-        if not dotmap[vertical][field]:
-            dotmap[vertical][field] = 0
-        if not dotmap["all"][field]:
-            dotmap["all"][field] = 0
-        dotmap[vertical][field] += value
-        dotmap["all"][field] += value
+        totals = [resources.setdefault(vertical, {}),
+                  resources.setdefault("all", {})]
+    for total in totals:
+        total[field] = total.get(field, 0) + value
 
 
 def get_tabs(app_list):
@@ -183,15 +248,54 @@ def index():
 
 @blueprint.route('/monitor', methods=['GET'])
 def monitor(cinema_mode=False):
+    mimetype = view_util.request_wants_json() or 'text/html'
+    return cached_response(cinema_mode, mimetype, lambda: render_monitor(cinema_mode, mimetype))
+
+
+@blueprint.route('/monitor/tab/<vertical>', methods=['GET'])
+def monitor_tab(vertical):
+    return cached_response(('tab', vertical), 'text/html', lambda: render_tab(vertical))
+
+
+def cached_response(view, mimetype, render):
+    query = view_util.get_normalized_query()
+    version = snapshot.get_version()
+    if request.if_none_match.contains(get_etag(version, view, mimetype, query)):
+        return monitor_response(Response(status=304), version, view, mimetype, query)
+    page = page_cache.get(version, (view, mimetype, query))
+    if page is None:
+        version, chunks = render()
+        page = stream_with_context(cache_chunks(version, (view, mimetype, query), chunks))
+    return monitor_response(Response(page, mimetype=mimetype), version, view, mimetype, query)
+
+
+def cache_chunks(version, key, chunks):
+    page = list()
+    for chunk in chunks:
+        page.append(chunk)
+        yield chunk
+    page_cache.put(version, key, ''.join(page))
+
+
+def monitor_response(response, version, view, mimetype, query):
+    response.set_etag(get_etag(version, view, mimetype, query))
+    response.vary.add('Accept')
+    return response
+
+
+def get_etag(version, view, mimetype, query):
+    return hashlib.sha1(repr((snapshot.instance, version, view, mimetype, query)).encode()).hexdigest()
+
+
+def get_monitor_state():
     group_filter, name_filter, status_filter, type_filter, env_filter = get_filter_values()
     active_color_filter = request.args.get('active_color_only', 'false') == 'true'
     status_filter = int(request.args.get('level', 0))
     include_jobs = request.args.get('jobs', 'true') == 'true'
     include_age = request.args.get('status_age', "true") == 'true'
-    auto_refresh = request.args.get('refresh', False)
 
-    app_list = get_all_apps()
-    filtered_apps = filter_state(app_list=app_list,
+    data = snapshot.get(build_snapshot)
+    filtered_apps = filter_state(app_list=data.apps,
                                  name_filter=name_filter,
                                  group_filter=group_filter,
                                  type_filter=type_filter,
@@ -199,22 +303,66 @@ def monitor(cinema_mode=False):
                                  status_filter=status_filter,
                                  include_jobs=include_jobs,
                                  include_age=include_age,
-                                 env_filter=env_filter)
-    vertical_resource_allocation, app_resource_allocation = get_app_resource_allocation(app_list)
+                                 env_filter=env_filter,
+                                 indexes=data.indexes)
     transformed_data = transform_to_display_data(filtered_apps)
-
-    return view_util.render("jellyfish.html",
-                            "Jellyfish",
-                            state=transformed_data,
-                            services_by_severity=list_services_by_severity(transformed_data),
-                            vertical_ressources=vertical_resource_allocation,
-                            app_ressources=app_resource_allocation,
-                            tabs=get_tabs(app_list),
-                            errors=get_error_messages(app_list),
-                            environments=filter_environments(config.config["environments"],
-                                                             env_filter),
-                            cinema_mode=cinema_mode,
-                            auto_refresh=auto_refresh)
+    services_by_severity = get_services_by_severity(transformed_data, data.rankings,
+                                                    whole_services=not (env_filter or type_filter or
+                                                                        active_color_filter or status_filter))
+    return data, transformed_data, services_by_severity, filter_environments(config.config["environments"],
+                                                                             env_filter)
+
+
+def render_monitor(cinema_mode, mimetype):
+    data, transformed_data, services_by_severity, environments = get_monitor_state()
+    if mimetype != 'text/html':
+        return data.version, [json.dumps({"version": data.version,
+                                          "state": transformed_data,
+                                          "services_by_severity": services_by_severity,
+                                          "tabs": sorted(data.tabs),
+                                          "errors": {vertical: sorted(messages)
+                                                     for vertical, messages in data.errors.items()}},
+                                         default=to_wire)]
+    return data.version, view_util.stream("jellyfish.html",
+                                          "Jellyfish",
+                                          state=transformed_data,
+                                          services_by_severity=services_by_severity,
+                                          vertical_ressources=data.vertical_resources,
+                                          app_ressources=data.app_resources,
+                                          tabs=data.tabs,
+                                          errors=data.errors,
+                                          environments=environments,
+                                          cinema_mode=cinema_mode,
+                                          auto_refresh=request.args.get('refresh', False))
+
+
+def render_tab(vertical):
+    data, transformed_data, services_by_severity, environments = get_monitor_state()
+    if vertical not in data.tabs:
+        abort(404)
+    return data.version, view_util.stream("tab_pane.html",
+                                          "Jellyfish",
+                                          vertical=vertical,
+                                          state=transformed_data,
+                                          services_by_severity=services_by_severity,
+                                          vertical_ressources=data.vertical_resources,
+                                          app_ressources=data.app_resources,
+                                          errors=data.errors,
+                                          environments=environments,
+                                          cinema_mode=False)
+
+
+def build_snapshot(version):
+    app_list = [Task.from_wire(app) for app in get_all_apps()]
+    vertical_resource_allocation, app_resource_allocation = allocation.get_totals()
+    return snapshot.Snapshot(version=version,
+                             apps=tuple(app_list),
+                             indexes=build_indexes(app_list),
+                             rankings=ranking.get_rankings(),
+                             vertical_resources=vertical_resource_allocation,
+                             app_resources=app_resource_allocation,
+                             tabs=get_tabs(app_list),
+                             errors=get_error_messages(app_list))
 
 
 def get_filter_values():
@@ -234,6 +382,13 @@ def get_filter_values():
     return group_filter, name_filter, status_filter, type_filter, env_filter
 
 
+@blueprint.route('/monitor/stream', methods=['GET'])
+def monitor_stream():
+    return Response(updates.stream(updates.subscribe()),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 @blueprint.route('/monitor/cinema', methods=['GET'])
 def toggles_cinema():
     return monitor(cinema_mode=True)
@@ -32,4 +32,4 @@ print(" Greedy: " + str(args.greedy))
 print(" Logging: " + str(args.verbose))
 print("\x1b[32m========================\x1b[0m")
 app = create_app(port=args.port, environment=args.env, working_dir=args.workdir, greedy_mode=args.greedy)
-app.run(debug=True, use_reloader=False, port=args.port, host='0.0.0.0')
+app.run(debug=True, use_reloader=False, port=args.port, host='0.0.0.0', threaded=True)
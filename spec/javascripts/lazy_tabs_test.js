@@ -0,0 +1,47 @@
+describe("lazy tabs", function () {
+    "use strict";
+
+    var lazy_tabs,
+        request;
+
+    beforeEach(function () {
+        setFixtures(
+            '<a href="#fish" data-toggle="tab">fish</a>' +
+            '<div id="fish" class="tab-pane js-lazy-tab" data-fragment="/monitor/tab/fish?level=2"></div>' +
+            '<div id="mammal" class="tab-pane active"><table></table></div>');
+
+        request = $.Deferred();
+        spyOn($, 'get').and.returnValue(request);
+        lazy_tabs = o_p13n.tools.lazy_tabs();
+    });
+
+    it("should load the fragment of a tab once", function () {
+        lazy_tabs.load($('#fish'));
+        lazy_tabs.load($('#fish'));
+        request.resolve('<table class="fish"></table>');
+
+        expect($.get).toHaveBeenCalledWith('/monitor/tab/fish?level=2');
+        expect($.get.calls.count()).toBe(1);
+        expect($('#fish')).toContainElement('table.fish');
+        expect($('#fish')).not.toHaveClass('js-lazy-tab');
+    });
+
+    it("should load the fragment again after a failed request", function () {
+        lazy_tabs.load($('#fish'));
+        request.reject();
+
+        expect($('#fish')).toHaveAttr('data-fragment', '/monitor/tab/fish?level=2');
+    });
+
+    it("should not load rendered tabs", function () {
+        expect(lazy_tabs.load($('#mammal'))).toBeNull();
+        expect($.get).not.toHaveBeenCalled();
+    });
+
+    it("should load the fragment when its tab is shown", function () {
+        lazy_tabs.init();
+        $('a[href="#fish"]').trigger('show.bs.tab');
+
+        expect($.get).toHaveBeenCalledWith('/monitor/tab/fish?level=2');
+    });
+});
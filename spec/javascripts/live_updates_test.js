@@ -0,0 +1,52 @@
+describe("live updates", function () {
+    "use strict";
+
+    var live_updates;
+
+    beforeEach(function () {
+        setFixtures(
+            '<div data-app="marathon::/develop/vertical/name" class="well">' +
+            '<big class="text-success js-instances">1/1</big>' +
+            '<span class="label label-success js-app-status">OK</span>' +
+            '<span data-job="import" class="health-dot health-dot-success"></span>' +
+            '</div>' +
+            '<div data-app="marathon::/develop/vertical/other" class="well"></div>');
+
+        live_updates = o_p13n.tools.live_updates();
+    });
+
+    it("should patch the status of a tile", function () {
+        live_updates.patch({
+            id: "marathon::/develop/vertical/name", status: 3, severity: 30, app_status: 2,
+            jobs: {"import": {status: 3, running: true}},
+            marathon: {instances: 2, healthy: 1, unhealthy: 1, running: 2, staged: 0}
+        });
+
+        var $tile = $('[data-app="marathon::/develop/vertical/name"]');
+        expect($tile).toHaveClass('well-danger');
+        expect($tile.find('.js-app-status')).toHaveClass('label-warning');
+        expect($tile.find('.js-app-status')).toHaveText('WARNING');
+        expect($tile.find('.js-instances')).toHaveClass('text-danger');
+        expect($tile.find('.js-instances')).toHaveText('1/2');
+        expect($tile.find('.js-unhealthy')).toHaveText('Unhealthy: 1');
+        expect($tile.find('[data-job="import"]')).toHaveClass('health-dot-danger');
+        expect($tile.find('[data-job="import"]')).toHaveClass('glowing');
+    });
+
+    it("should show suspended apps", function () {
+        live_updates.patch({
+            id: "marathon::/develop/vertical/name", status: 1, severity: 1, app_status: 1, jobs: {},
+            marathon: {instances: 0, healthy: 0, unhealthy: 0, running: 0, staged: 0}
+        });
+
+        expect($('.js-instances')).toHaveText('suspended');
+        expect($('[data-app="marathon::/develop/vertical/name"]')).toHaveClass('well-unknown');
+    });
+
+    it("should remove tiles of removed apps", function () {
+        live_updates.patch({id: "marathon::/develop/vertical/other", removed: true});
+
+        expect($('[data-app="marathon::/develop/vertical/other"]').length).toBe(0);
+        expect($('[data-app="marathon::/develop/vertical/name"]').length).toBe(1);
+    });
+});
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Compares the display data aggregation with the former DotMap based one and
+the memory held by plain dict tasks with the slotted task records.
+
+Run with: python -m tests.benchmark_views [number of apps]
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+
+from app import views
+from app.task import Task
+from tests.helper import testdata_helper
+
+try:
+    from dotmap import DotMap
+except ImportError:
+    DotMap = None
+
+
+def get_apps(count):
+    apps = list()
+    for i in range(count):
+        group = ['develop', 'live', 'ci'][i % 3]
+        vertical = 'vertical-' + str(i % 25)
+        name = 'app-' + str(i // 6)
+        color = ['GRN', 'BLU'][i // 3 % 2]
+        apps.append(testdata_helper.get_task(id='/'.join(['', group, vertical, name, color]), group=group,
+                                             vertical=vertical, name=name, color=color, source='marathon',
+                                             severity=i % 4))
+    return apps
+
+
+def dotmap_transform_to_display_data(apps):
+    display_data = DotMap()
+    for app in apps:
+        display_data["all"][app["full-name"]][app["group"]][app["color"]] = app
+        display_data[app["vertical"]][app["name"]][app["group"]][app["color"]] = app
+    return display_data.toDict()
+
+
+def dotmap_get_app_resource_allocation(tasks):
+    app_resources = DotMap()
+    vertical_resources = DotMap()
+    for task in tasks:
+        for field in ['cpu', 'mem']:
+            sum = task["marathon"]["instances"] * task["marathon"][field]
+            dotmap_add_to(app_resources, task["vertical"], task["name"], task["full-name"], field, sum)
+            dotmap_add_to(vertical_resources, task["vertical"], None, None, field, sum)
+    return vertical_resources.toDict(), app_resources.toDict()
+
+
+def dotmap_add_to(dotmap, vertical, name, full_name, field, value):
+    if name:
+        if not dotmap[vertical][name][field]:
+            dotmap[vertical][name][field] = 0
+        if not dotmap["all"][full_name][field]:
+            dotmap["all"][full_name][field] = 0
+        dotmap[vertical][name][field] += value
+        dotmap["all"][full_name][field] += value
+    else:
+        if not dotmap[vertical][field]:
+            dotmap[vertical][field] = 0
+        if not dotmap["all"][field]:
+            dotmap["all"][field] = 0
+        dotmap[vertical][field] += value
+        dotmap["all"][field] += value
+
+
+def measure(function, apps, repeat=5):
+    return min(timeit.repeat(lambda: function(apps), number=1, repeat=repeat)) * 1000
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1024
+
+
+def main(count):
+    apps = get_apps(count)
+    candidates = [('transform_to_display_data', views.transform_to_display_data, dotmap_transform_to_display_data),
+                  ('get_app_resource_allocation', views.get_app_resource_allocation,
+                   dotmap_get_app_resource_allocation)]
+    print("{} apps, best of 5 runs".format(count))
+    for name, function, dotmap_function in candidates:
+        line = "{:<28} dict: {:8.2f} ms".format(name, measure(function, apps))
+        if DotMap:
+            assert function(apps) == dotmap_function(apps)
+            line += "   DotMap: {:8.2f} ms".format(measure(dotmap_function, apps))
+        print(line)
+    raw_apps = [json.dumps(app) for app in apps]
+    print("{:<28} dict: {:8.0f} KiB   Task: {:8.0f} KiB".format(
+        'snapshot memory',
+        measure_memory(lambda: [json.loads(raw) for raw in raw_apps]),
+        measure_memory(lambda: [Task.from_wire(json.loads(raw)) for raw in raw_apps])))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
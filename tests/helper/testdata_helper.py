@@ -36,8 +36,8 @@ def get_task(id="/group/vertical/name",
                                                             "running": True},
                                                "thread-2": {"message": '05-07-2016 20:34 [33 seconds ago]',
                                                             "status": 2,
-                                                            "started": "2016-08-12T09:16:38.83+02:00",
-                                                            "stopped": "2016-08-15T09:16:38.82+02:00",
+                                                            "started": 1470986198.83,
+                                                            "stopped": 1471245398.82,
                                                             "running": False}},
         "marathon": marathon if marathon is not None else {"origin": origin,
                                                            "instances": instances,
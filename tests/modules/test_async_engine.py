@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import aiohttp
+import redislite
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app import config
+from app.modules import async_engine
+from tests.helper import testdata_helper
+
+
+class TestAsyncEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.maxDiff = None
+        config.rdb = redislite.Redis('redis.db')
+
+    def setUp(self):
+        config.rdb.flushall()
+        config.rdb.flushdb()
+        self.loop = asyncio.new_event_loop()
+        self.requests = list()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def serve(self, routes):
+        async def handler(request):
+            self.requests.append(request.path)
+            text, headers = routes[request.path]
+            return web.Response(text=text, headers=headers)
+
+        application = web.Application()
+        for path in routes:
+            application.router.add_get(path, handler)
+        return TestServer(application)
+
+    def run_with_server(self, routes, coroutine_function):
+        async def run():
+            async with self.serve(routes) as server:
+                async with aiohttp.ClientSession() as session:
+                    return await coroutine_function(session, server)
+
+        return self.loop.run_until_complete(run())
+
+    def test_get_application_status(self):
+        status = testdata_helper.get_status()
+        routes = {'/status': (json.dumps(status), {'x-color': 'GRN'})}
+
+        result = self.run_with_server(routes, lambda session, server: async_engine.get_application_status(
+            session, str(server.make_url('/status')), {}))
+        self.assertEqual((status, 'GRN', 200), result)
+
+    def test_get_application_status_not_json(self):
+        routes = {'/status': ('some html', {})}
+
+        result = self.run_with_server(routes, lambda session, server: async_engine.get_application_status(
+            session, str(server.make_url('/status')), {}))
+        self.assertEqual(({}, None, 200), result)
+
+    def test_get_application_status_not_available(self):
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                return await async_engine.get_application_status(session, "http://127.0.0.1:1/status", {})
+
+        self.assertEqual(({}, None, None), self.loop.run_until_complete(run()))
+
+    def test_get_service_info_matches_threaded_collector(self):
+        status = testdata_helper.get_status()
+        routes = {'/service/internal/status': (json.dumps(status), {'x-color': 'GRN'})}
+
+        def get_service_info(session, server):
+            url = str(server.make_url('/service/internal/status'))
+            return async_engine.get_service_info(session, {"id": "/group/vertical/name", "url": url})
+
+        task = self.run_with_server(routes, get_service_info)
+        expected = testdata_helper.get_task(source="standalone", status_url=task["status_url"])
+        del expected["marathon"]
+        self.assertDictEqual(expected, task)
+
+    @mock.patch('app.modules.async_engine.get_application_status')
+    def test_get_task_info_visit_staged(self, get_application_status):
+        responses = {"http://name.vertical.group.some-domain.com/service/internal/status":
+                         (testdata_helper.get_status(), "BLU", 200),
+                     "http://staged.name.vertical.group.some-domain.com/service/internal/status":
+                         (testdata_helper.get_status(status="ERROR"), "BLU", 200)}
+
+        async def fake_status(session, status_url, cfg):
+            return responses[status_url]
+
+        get_application_status.side_effect = fake_status
+        app = dict(self.get_marathon_app(), id="/group/vertical/name/GRN")
+        expected = testdata_helper.get_task(id="/group/vertical/name/GRN",
+                                            app_status=3, status=3, severity=30, active_color="BLU",
+                                            source="marathon",
+                                            color="GRN",
+                                            status_url='http://staged.name.vertical.group.some-domain.com/service/internal/status',
+                                            marathon_link='http://some-marathon.com/ui/#/apps/%2Fgroup%2Fvertical%2Fname%2FGRN')
+        self.assertDictEqual(expected, self.loop.run_until_complete(
+            async_engine.get_task_info(None, app, self.get_marathon_cfg())))
+
+    def test_update_marathon(self):
+        status = testdata_helper.get_status()
+        apps = {"apps": [self.get_marathon_app(), {"id": "/develop/mesos/marathon-healthcheck"}]}
+        routes = {'/v2/apps': (json.dumps(apps), {}),
+                  '/service/internal/status': (json.dumps(status), {'x-color': 'GRN'})}
+
+        async def update(session, server):
+            cfg = dict(self.get_marathon_cfg(), host=server.host + ':' + str(server.port))
+            with mock.patch('app.modules.marathon.get_status_url', return_value=str(
+                    server.make_url('/service/internal/status'))):
+                await async_engine.update_marathon(session, '1234', cfg)
+
+        self.run_with_server(routes, update)
+        self.assertEqual(['/v2/apps', '/service/internal/status'], self.requests)
+        self.assertEqual('marathon::/group/vertical/name', config.rdb.get('1234').decode())
+        self.assertEqual({b'marathon::/group/vertical/name'}, config.rdb.smembers('all-services'))
+        self.assertEqual(0, json.loads(config.rdb.get('marathon::/group/vertical/name').decode())['status'])
+
+    def test_schedule_greedy_runs_once_and_survives_errors(self):
+        calls = list()
+
+        async def collector(session, thread_id, cfg):
+            calls.append(thread_id)
+            raise ValueError()
+
+        self.loop.run_until_complete(async_engine.schedule(collector, None, '1234', {}, 60, greedy=True))
+        self.assertEqual(['1234'], calls)
+
+    def test_run_does_not_keep_cookies(self):
+        sessions = list()
+
+        async def schedule(collector, session, thread_id, cfg, interval, greedy=False):
+            sessions.append(session)
+
+        with mock.patch('app.modules.async_engine.schedule', schedule):
+            self.loop.run_until_complete(async_engine.run([('marathon', '1234', {})], 60, greedy=True))
+        self.assertIsInstance(sessions[0].cookie_jar, aiohttp.DummyCookieJar)
+
+    @staticmethod
+    def get_marathon_cfg():
+        return {"protocol": "http",
+                "host": "some-marathon.com",
+                "apps": "/v2/apps",
+                "username": "username",
+                "password": "password",
+                "blacklist": [".*marathon-healthcheck"],
+                "root_app_lable": "ROOT_APP",
+                "status_path_lable": "STATUS_PATH",
+                "base_domain": "some-domain.com"}
+
+    @staticmethod
+    def get_marathon_app():
+        return {"id": "/group/vertical/name",
+                "env": {"STATUS_PATH": "/service/internal/status"},
+                "instances": 1,
+                "cpus": 1,
+                "mem": 1024,
+                "tasksStaged": 0,
+                "tasksRunning": 1,
+                "tasksHealthy": 1,
+                "tasksUnhealthy": 0,
+                "labels": {}}
@@ -41,7 +41,7 @@ class TestAws(unittest.TestCase):
                           'mammal-cat': 'mammal-cat-develop'}, aws.get_beanstalk_environments(beanstalk_client))
 
     @mock.patch('app.modules.util.get_application_status', return_value=[{}, None, 200])
-    def test_get_beanstalk_health(self, *_):
+    def test_get_beanstalk_health(self, get_application_status, *_):
         beanstalk_client = MagicMock()
         service = {'id': '/dog-ci/vertical', 'domain_suffix': 'somewhere.com'}
         beanstalk_client.describe_environment_health = MagicMock(
@@ -68,3 +68,5 @@ class TestAws(unittest.TestCase):
                                                             beanstalk_client,
                                                             '/group/vertical/name',
                                                             'vertical-name-develop'))
+        get_application_status.assert_called_once_with(
+            'https://name.group.vertical.somewhere.com/vertical-name/internal/status', service, "aws::/dog-ci/vertical")
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from app.modules import scheduler
+from tests.helper import testdata_helper
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        scheduler.schedule.clear()
+        self.cfg = {"min_probe_interval": 60, "max_probe_interval": 240}
+
+    def test_get_result_without_probe(self):
+        self.assertIsNone(scheduler.get_result("marathon::/develop/vertical/name", testdata_helper.get_task(),
+                                               self.cfg, now=0))
+
+    def test_get_result_disabled_by_default(self):
+        task = testdata_helper.get_task()
+        scheduler.record("marathon::/develop/vertical/name", task, {}, "result", now=0)
+        self.assertIsNone(scheduler.get_result("marathon::/develop/vertical/name", task, {}, now=0))
+
+    def test_stable_app_backs_off_up_to_max(self):
+        key = "marathon::/develop/vertical/name"
+        task = testdata_helper.get_task()
+        intervals = list()
+        for now in [0, 60, 180, 420, 660]:
+            scheduler.record(key, task, self.cfg, "result", now=now)
+            intervals.append(scheduler.schedule[key]['interval'])
+        self.assertEqual([60, 120, 240, 240, 240], intervals)
+        self.assertEqual("result", scheduler.get_result(key, task, self.cfg, now=700))
+        self.assertIsNone(scheduler.get_result(key, task, self.cfg, now=900))
+
+    def test_changed_app_is_probed_at_min_interval(self):
+        key = "marathon::/develop/vertical/name"
+        scheduler.record(key, testdata_helper.get_task(), self.cfg, "result", now=0)
+        scheduler.record(key, testdata_helper.get_task(), self.cfg, "result", now=60)
+        scheduler.record(key, testdata_helper.get_task(version="2.0"), self.cfg, "result", now=180)
+        self.assertEqual(60, scheduler.schedule[key]['interval'])
+
+    def test_unhealthy_app_is_probed_at_min_interval(self):
+        key = "marathon::/develop/vertical/name"
+        task = testdata_helper.get_task(app_status=3, status=3)
+        for now in [0, 60, 120]:
+            scheduler.record(key, task, self.cfg, "result", now=now)
+        self.assertEqual(60, scheduler.schedule[key]['interval'])
+
+    def test_live_app_is_probed_at_min_interval(self):
+        key = "marathon::/live/vertical/name"
+        task = testdata_helper.get_task(group="live")
+        for now in [0, 60, 120]:
+            scheduler.record(key, task, self.cfg, "result", now=now)
+        self.assertEqual(60, scheduler.schedule[key]['interval'])
+
+    def test_marathon_change_makes_app_due(self):
+        key = "marathon::/develop/vertical/name"
+        scheduler.record(key, testdata_helper.get_task(), self.cfg, "result", now=0)
+        scheduler.record(key, testdata_helper.get_task(), self.cfg, "result", now=60)
+        self.assertIsNone(scheduler.get_result(key, testdata_helper.get_task(healthy=0), self.cfg, now=70))
+
+    def test_forget(self):
+        scheduler.record("marathon::/develop/vertical/name", testdata_helper.get_task(), self.cfg, "result", now=0)
+        scheduler.forget("marathon::/develop/vertical/name")
+        self.assertEqual({}, scheduler.schedule)
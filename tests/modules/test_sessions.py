@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Thread
+
+from app import config
+from app.modules import sessions
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=dog")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestSessions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        cls.url = "http://127.0.0.1:%d/status" % cls.server.server_port
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_get_session_is_shared_per_source(self):
+        session = sessions.get_session("shared", {})
+        self.assertIs(session, sessions.get_session("shared", {}))
+        self.assertIsNot(session, sessions.get_session("other", {}))
+
+    def test_get_session_ignores_pool_settings_of_later_calls(self):
+        session = sessions.get_session("first-wins", {"pool_maxsize": 3})
+        with self.assertLogs('app.modules.sessions', level='WARNING'):
+            self.assertIs(session, sessions.get_session("first-wins", {"pool_maxsize": 99}))
+        self.assertEqual(3, session.get_adapter("http://some-host").poolmanager.connection_pool_kw["maxsize"])
+
+    def test_pool_sizes_from_config(self):
+        session = sessions.get_session("configured", {"pool_connections": 5, "pool_maxsize": 7})
+        poolmanager = session.get_adapter("http://some-host").poolmanager
+        self.assertEqual(5, poolmanager.pools._maxsize)
+        self.assertEqual(7, poolmanager.connection_pool_kw["maxsize"])
+
+        session = sessions.get_session("defaults", {})
+        poolmanager = session.get_adapter("http://some-host").poolmanager
+        self.assertEqual(config.DEFAULT_POOL_CONNECTIONS, poolmanager.pools._maxsize)
+        self.assertEqual(config.DEFAULT_POOL_MAXSIZE, poolmanager.connection_pool_kw["maxsize"])
+
+    def test_connections_are_reused(self):
+        session = sessions.get_session("keep-alive", {})
+        for _ in range(3):
+            self.assertEqual(200, session.get(self.url, timeout=5).status_code)
+        self.assertEqual({'hits': 2, 'misses': 1}, sessions.get_counters()["keep-alive"])
+
+    def test_response_cookies_are_not_kept(self):
+        session = sessions.get_session("cookies", {})
+        session.get(self.url, cookies={"cake": "strawberry"}, timeout=5)
+        self.assertEqual(0, len(session.cookies))
@@ -40,6 +40,13 @@ class TestStandalone(unittest.TestCase):
         del expected["marathon"]
         self.assertDictEqual(expected, standalone.get_service_info(self.app_server_service))
 
+    @mock.patch('app.modules.util.get_application_status', return_value=[testdata_helper.get_status(), "GRN", 200])
+    def test_get_service_info_uses_pool_settings_of_all_services(self, request_mock, get_application_status):
+        service = dict(self.app_server_service, pool_maxsize=99)
+        with mock.patch('app.config.config', {'standalone': {'pool_maxsize': 20}}):
+            standalone.get_service_info(service)
+        get_application_status.assert_called_once_with(service["url"], service, "standalone", {'pool_maxsize': 20})
+
     def test_calculate_severity(self, _):
         self.assertEquals(1, util.calculate_severity({'status': 1, 'group': 'develop'}))
         self.assertEquals(30, util.calculate_severity({'status': 3, 'group': 'develop'}))
@@ -61,34 +61,45 @@ class TestUtil(unittest.TestCase):
                                      "running": "some-id"
                                  }))
 
-        self.assertDictEqual({"status": 2, "message": "warning", "started": "today", "stopped": None, "running": False},
+        self.assertDictEqual({"status": 2, "message": "warning", "started": 1470986198.83, "stopped": None,
+                              "running": False},
                              util.get_job_info(
                                  job={
                                      "status": "WARNING",
                                      "message": "warning",
-                                     "started": "today"
+                                     "started": "2016-08-12T09:16:38.83+02:00"
                                  }))
 
-        self.assertDictEqual({"status": 2, "message": "warning", "started": "today", "stopped": None, "running": False},
+        self.assertDictEqual({"status": 2, "message": "warning", "started": 1470986198.83, "stopped": None,
+                              "running": False},
                              util.get_job_info(
                                  job={
                                      "status": "WARNING",
                                      "message": "warning",
-                                     "started": "today",
+                                     "started": "2016-08-12T09:16:38.83+02:00",
                                      "running": None
                                  }))
 
         self.assertDictEqual(
-            {"status": 2, "message": "warning", "started": "yesterday", "stopped": "today", "running": True},
+            {"status": 2, "message": "warning", "started": 1470986198.83, "stopped": 1471245398.82, "running": True},
             util.get_job_info(
                 job={
                     "status": "WARNING",
                     "message": "warning",
-                    "started": "yesterday",
-                    "stopped": "today",
+                    "started": "2016-08-12T09:16:38.83+02:00",
+                    "stopped": "2016-08-15T09:16:38.82+02:00",
                     "running": "some-id"
                 }))
 
+        self.assertDictEqual({"status": 2, "message": "warning", "started": None, "stopped": None, "running": False},
+                             util.get_job_info(
+                                 job={
+                                     "status": "WARNING",
+                                     "message": "warning",
+                                     "started": "yesterday",
+                                     "stopped": "today"
+                                 }))
+
     def test_get_application_status_200(self, request_mock):
         status = testdata_helper.get_status()
         request_mock.register_uri('GET', "http://some-status-url/status", text=json.dumps(status),
@@ -130,12 +141,12 @@ class TestUtil(unittest.TestCase):
         self.assertEquals(400, status_code)
 
     def test_get_application_status_not_available(self, request_mock):
-        tmp = requests.get
-        requests.get = MagicMock(side_effect=requests.exceptions.Timeout)
+        tmp = requests.Session.get
+        requests.Session.get = MagicMock(side_effect=requests.exceptions.Timeout)
 
         app_status, active_color, status_code = util.get_application_status("http://some-status-url/status", {})
         self.assertEquals({}, app_status)
         self.assertEquals(0, len(request_mock.request_history))
         self.assertEquals(None, active_color)
         self.assertEquals(None, status_code)
-        requests.get = tmp
+        requests.Session.get = tmp
@@ -0,0 +1,46 @@
+import unittest
+
+from app import allocation
+from app import views
+from tests.helper import testdata_helper
+
+
+class TestAllocation(unittest.TestCase):
+    def setUp(self):
+        allocation.clear()
+        self.dog = testdata_helper.get_task(name='dog', vertical='mammal', instances=2)
+        self.cat = testdata_helper.get_task(name='cat', vertical='mammal')
+        self.salmon = testdata_helper.get_task(name='salmon', vertical='fish')
+        del self.salmon["marathon"]
+
+    def test_update_matches_full_recomputation(self):
+        allocation.update([('/mammal/dog', self.dog), ('/mammal/cat', self.cat), ('/fish/salmon', self.salmon)])
+
+        self.assertEqual(views.get_app_resource_allocation([self.dog, self.cat, self.salmon]),
+                         allocation.get_totals())
+
+    def test_update_applies_deltas(self):
+        allocation.update([('/mammal/dog', self.dog), ('/mammal/cat', self.cat)])
+        scaled_cat = testdata_helper.get_task(name='cat', vertical='mammal', instances=3)
+        allocation.update([('/mammal/cat', scaled_cat)])
+
+        self.assertEqual({'cpu': 5, 'mem': 5120}, allocation.get_vertical('mammal'))
+        self.assertEqual({'cpu': 3, 'mem': 3072}, allocation.get_app('mammal', 'no_source::cat'))
+        self.assertEqual({'cpu': 3, 'mem': 3072}, allocation.get_app('all', 'no_source::mammal-cat'))
+
+    def test_update_removes_apps(self):
+        allocation.update([('/mammal/dog', self.dog), ('/mammal/cat', self.cat)])
+        allocation.update([('/mammal/dog', None), ('/mammal/cat', None)])
+
+        self.assertIsNone(allocation.get_vertical('mammal'))
+        self.assertIsNone(allocation.get_app('mammal', 'no_source::dog'))
+        self.assertEqual(({}, {}), allocation.get_totals())
+
+    def test_update_keeps_fractions_exact(self):
+        task = testdata_helper.get_task(name='dog', vertical='mammal')
+        task["marathon"]["cpu"] = 0.1
+        for instances in [3, 7, 1]:
+            task["marathon"]["instances"] = instances
+            allocation.update([('/mammal/dog', task)])
+
+        self.assertEqual(0.1, allocation.get_vertical('mammal')['cpu'])
@@ -0,0 +1,141 @@
+import json
+import unittest
+
+from app import allocation
+from app import api
+from app import config
+from app import ranking
+from app import snapshot
+from app.start import create_app
+from tests.helper import testdata_helper
+
+
+class TestApi(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        flask_app = create_app(port=8080, environment="empty", working_dir="./", greedy_mode=True)
+        flask_app.config.update(DEBUG=True, SECRET_KEY='secret_key')
+        cls.client = flask_app.test_client()
+
+    def setUp(self):
+        config.rdb.flushall()
+        config.rdb.flushdb()
+        self.apps = [testdata_helper.get_task(id='/develop/mammal/dog', name='dog', vertical='mammal', group='develop',
+                                              source='marathon'),
+                     testdata_helper.get_task(id='/live/mammal/cat', name='cat', vertical='mammal', group='live',
+                                              source='marathon', status=3, app_status=3, severity=30),
+                     testdata_helper.get_task(id='/live/fish/salmon', name='salmon', vertical='fish', group='live',
+                                              source='marathon', status=2, app_status=2, severity=20)]
+        for app in self.apps:
+            config.rdb.set('marathon::' + app['id'], json.dumps(app))
+            config.rdb.sadd('all-services', 'marathon::' + app['id'])
+        allocation.clear()
+        ranking.clear()
+        snapshot.publish([('marathon::' + app['id'], app) for app in self.apps])
+
+    def get(self, url):
+        response = self.client.get(url)
+        return response.status_code, json.loads(response.data.decode())
+
+    def test_apps_sorted_by_severity(self):
+        status_code, data = self.get('/api/v1/apps?status_age=false')
+
+        self.assertEqual(200, status_code)
+        self.assertEqual(snapshot.get_version(), data['version'])
+        self.assertEqual(['/live/mammal/cat', '/live/fish/salmon', '/develop/mammal/dog'],
+                         [app['id'] for app in data['apps']])
+        self.assertEqual(self.apps[1], data['apps'][0])
+        self.assertIsNone(data['next'])
+
+    def test_apps_filtered(self):
+        _, data = self.get('/api/v1/apps?level=2&group=mammal&jobs=false')
+        self.assertEqual(['/live/mammal/cat'], [app['id'] for app in data['apps']])
+        self.assertEqual({}, data['apps'][0]['jobs'])
+
+        _, data = self.get('/api/v1/apps?env=!live&filter=dog')
+        self.assertEqual(['/develop/mammal/dog'], [app['id'] for app in data['apps']])
+
+    def test_apps_projection(self):
+        _, data = self.get('/api/v1/apps?fields=id,status,marathon.instances,unknown&level=3')
+        self.assertEqual([{'id': '/live/mammal/cat', 'status': 3, 'marathon': {'instances': 1}}], data['apps'])
+
+    def test_apps_projection_keeps_null_fields(self):
+        app = testdata_helper.get_task(id='/live/mammal/cat', name='cat', vertical='mammal', group='live',
+                                       source='marathon', status=3, app_status=3, severity=30, active_color=None,
+                                       status_page_status_code=None)
+        config.rdb.set('marathon::' + app['id'], json.dumps(app))
+        snapshot.publish([('marathon::' + app['id'], app)])
+
+        _, data = self.get('/api/v1/apps?fields=id,active_color,status_page_status_code,marathon.unknown&level=3')
+        self.assertEqual([{'id': '/live/mammal/cat', 'active_color': None, 'status_page_status_code': None}],
+                         data['apps'])
+
+    def test_apps_projection_of_nested_mappings(self):
+        response = self.client.get('/api/v1/apps?fields=id,jobs,marathon.labels&status_age=false')
+        data = json.loads(response.data.decode())
+        self.assertEqual([{'id': app['id'], 'jobs': app['jobs'], 'marathon': {'labels': app['marathon']['labels']}}
+                          for app in [self.apps[1], self.apps[2], self.apps[0]]], data['apps'])
+
+        _, data = self.get('/api/v1/apps?fields=jobs&status_age=false')
+        self.assertEqual([{'jobs': app['jobs']} for app in [self.apps[1], self.apps[2], self.apps[0]]], data['apps'])
+
+        _, data = self.get('/api/v1/apps?fields=marathon.labels')
+        self.assertEqual([{'marathon': {'labels': {}}}] * 3, data['apps'])
+
+    def test_apps_pagination(self):
+        ids = list()
+        url = '/api/v1/apps?fields=id&limit=2'
+        while url:
+            _, data = self.get(url)
+            ids.extend(app['id'] for app in data['apps'])
+            url = '/api/v1/apps?fields=id&limit=2&cursor=' + data['next'] if data['next'] else None
+        self.assertEqual(['/live/mammal/cat', '/live/fish/salmon', '/develop/mammal/dog'], ids)
+
+    def test_apps_pagination_with_equal_sort_fields(self):
+        apps = [testdata_helper.get_task(id='/group/v/' + subgroup + '/dog', name='dog', vertical='v',
+                                         source='marathon', origin=origin)
+                for subgroup, origin in [('a', 'one.com'), ('b', 'one.com'), ('b', 'two.com')]]
+        config.rdb.flushall()
+        allocation.clear()
+        ranking.clear()
+        for index, app in enumerate(apps):
+            config.rdb.set(str(index), json.dumps(app))
+            config.rdb.sadd('all-services', str(index))
+        snapshot.publish([(str(index), app) for index, app in enumerate(apps)])
+
+        pages = list()
+        url = '/api/v1/apps?fields=id,marathon.origin&limit=1'
+        while url:
+            _, data = self.get(url)
+            pages.extend((app['id'], app['marathon']['origin']) for app in data['apps'])
+            url = '/api/v1/apps?fields=id,marathon.origin&limit=1&cursor=' + data['next'] if data['next'] else None
+        self.assertEqual([('/group/v/a/dog', 'one.com'), ('/group/v/b/dog', 'one.com'), ('/group/v/b/dog', 'two.com')],
+                         pages)
+
+    def test_apps_bad_request(self):
+        self.assertEqual(400, self.get('/api/v1/apps?limit=0')[0])
+        self.assertEqual(400, self.get('/api/v1/apps?limit=' + str(api.MAX_LIMIT + 1))[0])
+        self.assertEqual(400, self.get('/api/v1/apps?level=high')[0])
+        self.assertEqual(400, self.get('/api/v1/apps?cursor=not-a-cursor')[0])
+        self.assertEqual(400, self.get('/api/v1/apps?cursor=' + api.encode_cursor({'a': 1}))[0])
+        self.assertEqual(400, self.get('/api/v1/apps?cursor=' + api.encode_cursor([0, 'a', 'b', 'c']))[0])
+
+    def test_resources(self):
+        status_code, data = self.get('/api/v1/resources')
+        self.assertEqual(200, status_code)
+        self.assertEqual({'all': {'cpu': 3, 'mem': 3072}, 'mammal': {'cpu': 2, 'mem': 2048},
+                          'fish': {'cpu': 1, 'mem': 1024}}, data['verticals'])
+        self.assertEqual({'cpu': 1, 'mem': 1024}, data['apps']['mammal']['marathon::dog'])
+
+        self.assertEqual((200, {'cpu': 2, 'mem': 2048}), self.get('/api/v1/resources?vertical=mammal'))
+        self.assertEqual((200, {'cpu': 1, 'mem': 1024}), self.get('/api/v1/resources?vertical=fish&app=marathon::salmon'))
+        self.assertEqual(404, self.get('/api/v1/resources?vertical=bird')[0])
+
+    def test_ranking(self):
+        self.assertEqual((200, {'vertical': 'all',
+                                'services': [{'name': 'marathon::mammal-cat', 'severity': 30},
+                                             {'name': 'marathon::fish-salmon', 'severity': 20}]}),
+                         self.get('/api/v1/ranking?limit=2'))
+        self.assertEqual(['marathon::cat', 'marathon::dog'],
+                         [service['name'] for service in self.get('/api/v1/ranking?vertical=mammal')[1]['services']])
+        self.assertEqual(400, self.get('/api/v1/ranking?limit=0')[0])
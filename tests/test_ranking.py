@@ -0,0 +1,43 @@
+import unittest
+
+from app import ranking
+from app import views
+from tests.helper import testdata_helper
+
+
+class TestRanking(unittest.TestCase):
+    def setUp(self):
+        ranking.clear()
+        self.apps = {'/develop/mammal/dog': testdata_helper.get_task(name='dog', vertical='mammal', severity=2),
+                     '/live/mammal/dog': testdata_helper.get_task(name='dog', vertical='mammal', group='live',
+                                                                  severity=200),
+                     '/develop/mammal/cat': testdata_helper.get_task(name='cat', vertical='mammal', severity=30),
+                     '/develop/mammal/ape': testdata_helper.get_task(name='ape', vertical='mammal', severity=30),
+                     '/develop/fish/eel': testdata_helper.get_task(name='eel', vertical='fish', severity=0)}
+
+    def test_update_matches_full_sort(self):
+        ranking.update(self.apps.items())
+
+        expected = views.list_services_by_severity(views.transform_to_display_data(self.apps.values()))
+        self.assertEqual(expected, ranking.get_rankings())
+
+    def test_update_moves_changed_services(self):
+        ranking.update(self.apps.items())
+        ranking.update([('/develop/fish/eel', testdata_helper.get_task(name='eel', vertical='fish', severity=300)),
+                        ('/live/mammal/dog', None)])
+
+        self.assertEqual(['no_source::fish-eel', 'no_source::mammal-ape', 'no_source::mammal-cat',
+                          'no_source::mammal-dog'], ranking.get_rankings()['all'])
+        self.assertEqual(['no_source::ape', 'no_source::cat', 'no_source::dog'], ranking.get_rankings()['mammal'])
+
+    def test_update_removes_empty_verticals(self):
+        ranking.update(self.apps.items())
+        ranking.update([('/develop/fish/eel', None)])
+
+        self.assertNotIn('fish', ranking.get_rankings())
+        self.assertEqual([], ranking.top('fish', 3))
+
+    def test_top(self):
+        ranking.update(self.apps.items())
+
+        self.assertEqual([('no_source::mammal-dog', 202), ('no_source::mammal-ape', 30)], ranking.top('all', 2))
@@ -0,0 +1,42 @@
+import json
+import unittest
+
+from app import serializer
+from tests.helper import testdata_helper
+
+
+class TestSerializer(unittest.TestCase):
+    def tearDown(self):
+        serializer.configure('json')
+
+    def test_json(self):
+        task = testdata_helper.get_task()
+        self.assertEqual(json.dumps(task).encode(), serializer.dumps(task))
+        self.assertEqual(task, serializer.loads(serializer.dumps(task)))
+
+    def test_msgpack(self):
+        task = testdata_helper.get_task()
+        serializer.configure('msgpack')
+
+        raw = serializer.dumps(task)
+        self.assertLess(len(raw), len(json.dumps(task)))
+        self.assertEqual(task, serializer.loads(raw))
+
+    def test_msgpack_reads_json(self):
+        task = testdata_helper.get_task()
+        serializer.configure('msgpack')
+
+        self.assertEqual(task, serializer.loads(json.dumps(task).encode()))
+
+    def test_unknown_serializer(self):
+        self.assertRaises(ValueError, serializer.configure, 'pickle')
+        self.assertEqual('json', serializer.current)
+
+    def test_get_counters(self):
+        encoded = serializer.get_counters()['encoded']
+        serializer.loads(serializer.dumps(testdata_helper.get_task()))
+
+        counters = serializer.get_counters()
+        self.assertEqual('json', counters['serializer'])
+        self.assertEqual(encoded + 1, counters['encoded'])
+        self.assertGreater(counters['averageBytes'], 0)
@@ -0,0 +1,44 @@
+import unittest
+from threading import Thread
+
+from app import snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        snapshot.current = None
+        self.builds = list()
+
+    def build(self, version):
+        self.builds.append(version)
+        return snapshot.Snapshot(version=version, apps=(), indexes={}, rankings={}, vertical_resources={},
+                                 app_resources={}, tabs=['all'], errors={'all': set()})
+
+    def test_get_builds_once_per_version(self):
+        version = snapshot.publish()
+        self.assertIs(snapshot.get(self.build), snapshot.get(self.build))
+        self.assertEqual([version], self.builds)
+
+    def test_publish_makes_new_snapshot(self):
+        first = snapshot.get(self.build)
+        version = snapshot.publish()
+        second = snapshot.get(self.build)
+
+        self.assertEqual(first.version + 1, version)
+        self.assertEqual(version, second.version)
+        self.assertEqual(version, snapshot.get_version())
+        self.assertEqual([first.version, version], self.builds)
+
+    def test_publish_does_not_wait_for_a_build(self):
+        published = list()
+
+        def build(version):
+            thread = Thread(target=lambda: published.append(snapshot.publish()))
+            thread.start()
+            thread.join(timeout=5)
+            return self.build(version)
+
+        built = snapshot.get(build)
+
+        self.assertEqual([built.version + 1], published)
+        self.assertEqual(built.version + 1, snapshot.get(self.build).version)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import unittest
+from unittest import mock
 from unittest.mock import Mock
 
 import redislite
@@ -74,3 +75,29 @@ class TestStart(unittest.TestCase):
         self.assertEqual("update_aws", mock.call_args_list[2][0][1].__name__)
         self.assertEqual({'id': '/dog-ci/vertical', 'access_key': 'AAAA', 'secret_key': '1234'},
                          mock.call_args_list[2][0][2])
+
+    def test_start_tasks_asyncio_engine(self):
+        config_file = {
+            "engine": "asyncio",
+            "marathons": [{"host": "localhost:12345"}],
+            "aws": [{"id": "/dog-ci/vertical"}]
+        }
+
+        with mock.patch('app.modules.async_engine.start') as engine_start:
+            start.start_tasks(config_file, True)
+
+        jobs, interval, greedy = engine_start.call_args[0]
+        self.assertEqual(['marathon', 'aws'], [source for source, _, _ in jobs])
+        self.assertEqual([{"host": "localhost:12345"}, {"id": "/dog-ci/vertical"}], [cfg for _, _, cfg in jobs])
+        self.assertEqual(config.THREAD_UPDATE_INTERVAL, interval)
+        self.assertTrue(greedy)
+        self.assertEqual([b'/dog-ci/vertical', b'localhost:12345'], config.rdb.lrange('thread-list', 0, -1))
+
+    def test_start_tasks_marathon_event_mode(self):
+        config_file = {"marathons": [{"host": "localhost:12345", "mode": "events"}]}
+
+        with mock.patch('app.start.start_thread_timer') as start_thread_timer:
+            start.start_tasks(config_file, True)
+
+        self.assertEqual("update_marathon", start_thread_timer.call_args[0][1].__name__)
+        self.assertEqual("app.modules.marathon_events", start_thread_timer.call_args[0][1].__module__)
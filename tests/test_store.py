@@ -0,0 +1,79 @@
+import json
+import unittest
+
+import redislite
+
+from app import config
+from app import store
+from app import views
+from app.modules import standalone
+from tests.helper import testdata_helper
+
+
+def run_commands(rdb):
+    rdb.flushall()
+    results = [rdb.set('/mammal/dog', json.dumps({'info': 'dog'})),
+               rdb.set(b'/mammal/cat', b'cat'),
+               rdb.get('/mammal/dog'),
+               rdb.get(b'/mammal/cat'),
+               rdb.get('/mammal/ape'),
+               rdb.mget(['/mammal/dog', '/mammal/ape', b'/mammal/cat']),
+               rdb.sadd('all-services', '/mammal/dog', '/mammal/cat'),
+               rdb.sadd('all-services', '/mammal/dog'),
+               rdb.srem('all-services', '/mammal/cat', '/mammal/ape'),
+               rdb.smembers('all-services'),
+               rdb.smembers('no-services'),
+               rdb.lpush('thread-list', 'first'),
+               rdb.lpush('thread-list', 'second', 'third'),
+               rdb.lrange('thread-list', 0, -1),
+               rdb.lrange('thread-list', 1, 1),
+               rdb.lrange('thread-list', 0, -2),
+               rdb.delete('/mammal/cat', '/mammal/ape'),
+               rdb.get('/mammal/cat')]
+    pipeline = rdb.pipeline()
+    pipeline.set('/fish/eel', 'eel')
+    pipeline.sadd('all-services', '/fish/eel')
+    pipeline.get('/fish/eel')
+    pipeline.delete('/mammal/dog')
+    pipeline.srem('all-services', '/mammal/dog')
+    results.append(pipeline.execute())
+    results.append(rdb.smembers('all-services'))
+    results.append(pipeline.execute())
+    return results
+
+
+class TestStore(unittest.TestCase):
+    def tearDown(self):
+        config.rdb = None
+
+    def test_memory_store_answers_like_redis(self):
+        self.assertEqual(run_commands(redislite.Redis('redis.db')), run_commands(store.MemoryStore()))
+
+    def test_create(self):
+        self.assertIsInstance(store.create('memory', ''), store.MemoryStore)
+        self.assertIsInstance(store.create('redis', ''), redislite.Redis)
+        with self.assertRaises(ValueError):
+            store.create('memcached', '')
+
+    def test_pipeline_rejects_unknown_commands(self):
+        with self.assertRaises(AttributeError):
+            store.MemoryStore().pipeline().hgetall('key')
+
+    def test_memory_store_keeps_decoded_tasks(self):
+        config.rdb = store.MemoryStore()
+        task = testdata_helper.get_task(id='/develop/mammal/dog')
+
+        standalone.save_tasks([('/develop/mammal/dog', task)])
+
+        self.assertIs(task, config.rdb.get('/develop/mammal/dog'))
+        self.assertIs(task, views.get_all_apps()[0])
+
+    def test_redis_store_encodes_tasks(self):
+        config.rdb = redislite.Redis('redis.db')
+        config.rdb.flushall()
+        task = testdata_helper.get_task(id='/develop/mammal/dog')
+
+        standalone.save_tasks([('/develop/mammal/dog', task)])
+
+        self.assertIsInstance(config.rdb.get('/develop/mammal/dog'), bytes)
+        self.assertEqual([task], views.get_all_apps())
@@ -0,0 +1,85 @@
+import json
+import unittest
+
+from app.task import Job, Marathon, Task, as_task, freeze, to_wire
+from tests.helper import testdata_helper
+
+
+class TestTask(unittest.TestCase):
+    def test_round_trip(self):
+        data = testdata_helper.get_task(type='java')
+        task = Task.from_wire(data)
+
+        self.assertEqual(data, task.to_wire())
+        self.assertIsInstance(task.marathon, Marathon)
+        self.assertIsInstance(task.jobs['thread-2'], Job)
+        self.assertEqual('no_source::vertical-name', task.full_name)
+
+    def test_behaves_like_the_wire_dict(self):
+        data = testdata_helper.get_task()
+        task = Task.from_wire(data)
+
+        self.assertEqual(data, task)
+        self.assertEqual('no_source::vertical-name', task['full-name'])
+        self.assertEqual('some-marathon.com', task['marathon']['origin'])
+        self.assertEqual(2, task['jobs']['thread-2']['status'])
+
+    def test_missing_fields_are_absent(self):
+        task = Task.from_wire({'id': '/develop/mammal/dog', 'status': 1})
+
+        self.assertNotIn('marathon', task)
+        self.assertIsNone(task.get('marathon'))
+        self.assertEqual({'id': '/develop/mammal/dog', 'status': 1}, task.to_wire())
+        with self.assertRaises(KeyError):
+            task['marathon']
+
+    def test_has_no_instance_dict(self):
+        task = Task.from_wire(testdata_helper.get_task())
+
+        self.assertFalse(hasattr(task, '__dict__'))
+        with self.assertRaises(AttributeError):
+            task.unknown = 'value'
+
+    def test_is_immutable(self):
+        task = Task.from_wire(testdata_helper.get_task(type='java'))
+
+        with self.assertRaises(AttributeError):
+            task.status = 3
+        with self.assertRaises(AttributeError):
+            del task.marathon.instances
+        with self.assertRaises(TypeError):
+            task.jobs['thread-3'] = task.jobs['thread-1']
+        with self.assertRaises(TypeError):
+            task.marathon.labels['type'] = 'go'
+        self.assertEqual({'type': 'java'}, json.loads(json.dumps(task, default=to_wire))['marathon']['labels'])
+
+    def test_replace_does_not_change_the_record(self):
+        task = Task.from_wire(testdata_helper.get_task())
+
+        replaced = task.replace(jobs={})
+
+        self.assertEqual({}, replaced.jobs)
+        self.assertEqual(2, len(task.jobs))
+        self.assertIs(task.marathon, replaced.marathon)
+
+    def test_freeze(self):
+        task = Task.from_wire(testdata_helper.get_task(type='java'))
+
+        self.assertIs(task.freeze(), freeze(task))
+        self.assertEqual(freeze(task), freeze(Task.from_wire(testdata_helper.get_task(type='java'))))
+        self.assertNotEqual(freeze(task), freeze(task.replace(version='0.2.0')))
+        self.assertEqual(freeze({'b': [1, {'c': 2}], 'a': 1}), freeze({'a': 1, 'b': [1, {'c': 2}]}))
+        hash(freeze(task))
+
+    def test_as_task(self):
+        task = Task.from_wire(testdata_helper.get_task())
+
+        self.assertIs(task, as_task(task))
+        self.assertEqual(task, as_task(testdata_helper.get_task()))
+
+    def test_to_wire_as_json_default(self):
+        data = testdata_helper.get_task()
+
+        self.assertEqual(data, json.loads(json.dumps({'app': Task.from_wire(data)}, default=to_wire))['app'])
+        with self.assertRaises(TypeError):
+            json.dumps({'app': object()}, default=to_wire)
@@ -0,0 +1,61 @@
+import json
+import unittest
+
+from app import updates
+from tests.helper import testdata_helper
+
+
+class TestUpdates(unittest.TestCase):
+    def setUp(self):
+        updates.digests.clear()
+        updates.subscribers.clear()
+
+    def test_push_sends_only_changed_apps(self):
+        subscriber = updates.subscribe()
+        task = testdata_helper.get_task(source="marathon")
+
+        updates.push([("marathon::/group/vertical/name", task)])
+        updates.push([("marathon::/group/vertical/name", task)])
+        updates.push([("marathon::/group/vertical/name", dict(task, status=3, severity=30))])
+
+        first = subscriber.get_nowait()
+        self.assertEqual({"id": "marathon::/group/vertical/name",
+                          "status": 0,
+                          "severity": 0,
+                          "app_status": 0,
+                          "jobs": {"thread-1": {"status": 0, "running": True},
+                                   "thread-2": {"status": 2, "running": False}},
+                          "marathon": {"instances": 1, "healthy": 1, "unhealthy": 0, "running": 1, "staged": 0}},
+                         first)
+        self.assertEqual(3, subscriber.get_nowait()["status"])
+        self.assertTrue(subscriber.empty())
+
+    def test_push_removed_app(self):
+        updates.push([("marathon::/group/vertical/name", testdata_helper.get_task(source="marathon"))])
+        subscriber = updates.subscribe()
+
+        self.assertEqual([{"id": "marathon::/group/vertical/name", "removed": True}],
+                         updates.push([("marathon::/group/vertical/name", None)]))
+        self.assertEqual([], updates.push([("marathon::/group/vertical/name", None)]))
+        self.assertEqual({"id": "marathon::/group/vertical/name", "removed": True}, subscriber.get_nowait())
+
+    def test_push_drops_slow_subscribers(self):
+        subscriber = updates.subscribe()
+        updates.push([("marathon::/group/vertical/" + str(i), testdata_helper.get_task(source="marathon", id=str(i)))
+                      for i in range(updates.QUEUE_SIZE + 1)])
+
+        self.assertNotIn(subscriber, updates.subscribers)
+
+    def test_stream(self):
+        subscriber = updates.subscribe()
+        stream = updates.stream(subscriber, keepalive=0.01)
+        self.assertEqual("retry: 5000\n\n", next(stream))
+        self.assertEqual(": keepalive\n\n", next(stream))
+
+        updates.push([("standalone::/group/vertical/name", testdata_helper.get_task(source="standalone"))])
+        event = next(stream)
+        self.assertTrue(event.startswith("event: app\ndata: "))
+        self.assertEqual("standalone::/group/vertical/name", json.loads(event.split("data: ")[1])["id"])
+
+        stream.close()
+        self.assertNotIn(subscriber, updates.subscribers)
@@ -1,11 +1,19 @@
 import json
 import unittest
+from unittest import mock
 
 import redislite
-from dotmap import DotMap
 
+from app import allocation
 from app import config
+from app import page_cache
+from app import ranking
+from app import snapshot
+from app import view_util
 from app import views
+from app.lru import LRUCache
+from app.task import Task
+from app.start import create_app
 from tests.helper import testdata_helper
 
 
@@ -28,14 +36,42 @@ class TestView(unittest.TestCase):
         config.rdb.set('/fish/salmon', json.dumps({'info': 'fish'}))
         config.rdb.sadd('all-services', '/mammal/cat', '/fish/salmon')
 
-        self.assertCountEqual([DotMap(info='mammal'), DotMap(info='fish')], views.get_all_apps())
+        self.assertCountEqual([{'info': 'mammal'}, {'info': 'fish'}], views.get_all_apps())
 
     def test_get_state_with_non_existent_app(self):
         config.rdb.set('/mammal/cat', json.dumps({'info': 'mammal'}))
         config.rdb.set('/fish/salmon', json.dumps({'info': 'fish'}))
         config.rdb.sadd('all-services', '/mammal/cat', '/fish/salmon', 'banana/pyjama')
 
-        self.assertCountEqual([DotMap(info='mammal'), DotMap(info='fish')], views.get_all_apps())
+        self.assertCountEqual([{'info': 'mammal'}, {'info': 'fish'}], views.get_all_apps())
+
+    def test_get_state_reads_apps_in_bulk(self):
+        config.rdb.set('/mammal/cat', json.dumps({'info': 'mammal'}))
+        config.rdb.set('/fish/salmon', json.dumps({'info': 'fish'}))
+        config.rdb.sadd('all-services', '/mammal/cat', '/fish/salmon')
+
+        with mock.patch.object(config.rdb, 'get', side_effect=AssertionError):
+            self.assertCountEqual([{'info': 'mammal'}, {'info': 'fish'}], views.get_all_apps())
+
+    def test_get_state_without_apps(self):
+        self.assertEqual([], views.get_all_apps())
+
+    def test_build_snapshot(self):
+        config.rdb.set('marathon::/mammal/cat', json.dumps(self.test_apps[1]))
+        config.rdb.set('marathon::/fish/salmon', json.dumps(self.test_apps[2]))
+        config.rdb.sadd('all-services', 'marathon::/mammal/cat', 'marathon::/fish/salmon')
+        config.rdb.set('some-marathon.com-errors', 'error')
+        allocation.clear()
+        ranking.clear()
+        snapshot.publish([('marathon::/mammal/cat', self.test_apps[1]), ('marathon::/fish/salmon', self.test_apps[2])])
+
+        data = views.build_snapshot(7)
+        self.assertEqual(7, data.version)
+        self.assertCountEqual([self.test_apps[1], self.test_apps[2]], data.apps)
+        self.assertCountEqual(['all', 'mammal', 'fish'], data.tabs)
+        self.assertEqual({'all': {'error'}, 'mammal': {'error'}, 'fish': {'error'}}, data.errors)
+        self.assertEqual({'all': {'cpu': 2, 'mem': 2048}, 'mammal': {'cpu': 1, 'mem': 1024},
+                          'fish': {'cpu': 1, 'mem': 1024}}, data.vertical_resources)
 
     def test_filter(self):
         self.assertEqual(True, views.filter(name="dog", include=[], exclude=[]))
@@ -101,12 +137,50 @@ class TestView(unittest.TestCase):
         test_apps = [testdata_helper.get_task(status=1, name='dog', vertical='mammal'),
                      testdata_helper.get_task(status=2, name='cat', vertical='mammal'),
                      testdata_helper.get_task(status=3, name='salmon', vertical='fish')]
-        expected = [test_apps[1],
-                    test_apps[2]]
+        expected = [dict(test_apps[1], jobs={'thread-2': test_apps[1]["jobs"]['thread-2']}),
+                    dict(test_apps[2], jobs={'thread-2': test_apps[2]["jobs"]['thread-2']})]
         self.assertEqual(expected,
                          views.filter_state(app_list=test_apps, name_filter=None, group_filter=None, type_filter=None,
                                             active_color_only_filter=False,
                                             status_filter=2, include_jobs=True, include_age=False, env_filter=False))
+        self.assertEqual(testdata_helper.get_task(status=2, name='cat', vertical='mammal'), test_apps[1])
+
+    @mock.patch('app.views.time.time', return_value=1471245398.82 + 3 * 60 * 60)
+    def test_filter_state_job_age(self, _):
+        test_apps = [testdata_helper.get_task(status=2, name='cat', vertical='mammal')]
+
+        filtered = views.filter_state(app_list=test_apps, name_filter=None, group_filter=None, type_filter=None,
+                                      active_color_only_filter=False, status_filter=0, include_jobs=True,
+                                      include_age=True, env_filter=False)
+
+        self.assertEqual("3 hours ago", filtered[0]["jobs"]["thread-2"]["age"])
+        self.assertNotIn("age", filtered[0]["jobs"]["thread-1"])
+
+    def test_filter_state_shares_unchanged_records(self):
+        test_apps = tuple(Task.from_wire(testdata_helper.get_task(status=status, name=name, vertical='mammal'))
+                          for status, name in [(0, 'dog'), (2, 'cat')])
+
+        filtered = views.filter_state(app_list=test_apps, name_filter=None, group_filter=None, type_filter=None,
+                                      active_color_only_filter=False, status_filter=0, include_jobs=True,
+                                      include_age=False, env_filter=False)
+        self.assertIs(test_apps[0], filtered[0])
+        self.assertIs(test_apps[1], filtered[1])
+
+        filtered = views.filter_state(app_list=test_apps, name_filter=None, group_filter=None, type_filter=None,
+                                      active_color_only_filter=False, status_filter=2, include_jobs=True,
+                                      include_age=False, env_filter=False)
+        self.assertEqual(['thread-2'], list(filtered[0]["jobs"]))
+        self.assertEqual(['thread-1', 'thread-2'], sorted(test_apps[1]["jobs"]))
+
+    def test_format_age(self):
+        self.assertEqual("now", views.format_age(-5))
+        self.assertEqual("1 second ago", views.format_age(1.5))
+        self.assertEqual("59 seconds ago", views.format_age(59))
+        self.assertEqual("1 minute ago", views.format_age(60))
+        self.assertEqual("2 hours ago", views.format_age(2 * 60 * 60 + 59))
+        self.assertEqual("3 days ago", views.format_age(3 * 24 * 60 * 60))
+        self.assertEqual("2 months ago", views.format_age(65 * 24 * 60 * 60))
+        self.assertEqual("1 year ago", views.format_age(400 * 24 * 60 * 60))
 
     def test_filter_state_no_jobs(self):
         test_apps = [testdata_helper.get_task(name='dog', vertical='mammal'),
@@ -147,6 +221,55 @@ class TestView(unittest.TestCase):
                                                            status_filter=0, include_jobs=True, include_age=False,
                                                            env_filter=['live']))
 
+    def test_build_indexes(self):
+        test_apps = [testdata_helper.get_task(name='dog', vertical='mammal', type='service'),
+                     testdata_helper.get_task(name='cat', vertical='mammal', status=2, color='BLU'),
+                     testdata_helper.get_task(name='salmon', vertical='fish', group='live', active_color=None)]
+
+        indexes = views.build_indexes(test_apps)
+        self.assertEqual({'dog': {0}, 'cat': {1}, 'salmon': {2}}, indexes['name'])
+        self.assertEqual({'mammal': {0, 1}, 'fish': {2}}, indexes['vertical'])
+        self.assertEqual({'group': {0, 1}, 'live': {2}}, indexes['group'])
+        self.assertEqual({'service': {0}, '': {1, 2}}, indexes['type'])
+        self.assertEqual({0: {0, 2}, 2: {1}}, indexes['status'])
+        self.assertEqual({0, 2}, indexes['active_color'])
+
+    def test_filter_state_with_indexes(self):
+        test_apps = [testdata_helper.get_task(name='dog', vertical='mammal', type='service'),
+                     testdata_helper.get_task(name='cat', vertical='mammal', status=2, color='BLU'),
+                     testdata_helper.get_task(name='salmon', vertical='fish', group='live', status=3)]
+        indexes = views.build_indexes(test_apps)
+
+        def names(**filters):
+            arguments = dict(name_filter=None, group_filter=None, type_filter=None, active_color_only_filter=False,
+                             status_filter=0, include_jobs=False, include_age=False, env_filter=None)
+            arguments.update(filters)
+            return [app['name'] for app in views.filter_state(test_apps, indexes=indexes, **arguments)]
+
+        self.assertEqual(['no_source::dog', 'no_source::cat', 'no_source::salmon'], names())
+        self.assertEqual(['no_source::cat', 'no_source::salmon'], names(status_filter=2))
+        self.assertEqual(['no_source::salmon'], names(status_filter=2, group_filter=['!mammal']))
+        self.assertEqual(['no_source::dog', 'no_source::salmon'], names(name_filter=['dog', 'salmon', 'eel']))
+        self.assertEqual(['no_source::dog'], names(type_filter=['service'], env_filter=['group']))
+        self.assertEqual(['no_source::dog', 'no_source::salmon'], names(active_color_only_filter=True))
+        self.assertEqual([], names(env_filter=['live'], group_filter=['mammal']))
+
+    def test_filter_state_starts_from_included_apps(self):
+        class Apps(list):
+            def __len__(self):
+                raise AssertionError("all apps were scanned")
+
+        test_apps = [testdata_helper.get_task(name='dog', vertical='mammal'),
+                     testdata_helper.get_task(name='cat', vertical='mammal', status=2),
+                     testdata_helper.get_task(name='salmon', vertical='fish', status=3)]
+        indexes = views.build_indexes(test_apps)
+        test_apps = Apps(test_apps)
+
+        filtered = views.filter_state(test_apps, name_filter=['!salmon'], group_filter=['mammal'], type_filter=None,
+                                      active_color_only_filter=True, status_filter=2, include_jobs=False,
+                                      include_age=False, env_filter=None, indexes=indexes)
+        self.assertEqual(['no_source::cat'], [app['name'] for app in filtered])
+
     def test_transform_to_display_data(self):
         test_apps = [testdata_helper.get_task(status=1, name='dog', vertical='mammal'),
                      testdata_helper.get_task(status=3, name='salmon', vertical='fish')]
@@ -191,6 +314,18 @@ class TestView(unittest.TestCase):
         }
         self.assertDictEqual(expected, views.transform_to_display_data(test_apps))
 
+    def test_get_services_by_severity(self):
+        transformed_data = views.transform_to_display_data(self.test_apps)
+        rankings = {'all': ['no_source::fish-salmon', 'no_source::mammal-dog', 'no_source::mammal-cat'],
+                    'mammal': ['no_source::dog', 'no_source::cat']}
+
+        self.assertEqual({'all': ['no_source::fish-salmon', 'no_source::mammal-dog', 'no_source::mammal-cat'],
+                          'mammal': ['no_source::dog', 'no_source::cat'],
+                          'fish': ['no_source::salmon']},
+                         views.get_services_by_severity(transformed_data, rankings, whole_services=True))
+        self.assertEqual(views.list_services_by_severity(transformed_data),
+                         views.get_services_by_severity(transformed_data, rankings, whole_services=False))
+
     def test_sum_severity_per_service(self):
         dog = {'develop': {'GRN': testdata_helper.get_task(status=1, severity=1, name='dog', vertical='mammal')}}
         tuna = {'develop': {'GRN': testdata_helper.get_task(status=3, severity=3, name='salmon', vertical='fish'),
@@ -294,7 +429,8 @@ class TestView(unittest.TestCase):
         config.rdb.set("cat-errors", "error cat")
         config.rdb.set("salmon-errors", "error salmon")
 
-        self.assertEqual(expected, views.get_error_messages(test_apps))
+        with mock.patch.object(config.rdb, 'get', side_effect=AssertionError):
+            self.assertEqual(expected, views.get_error_messages(test_apps))
 
     def test_filter_environments(self):
         envs = [{'name': 'dev-ci', 'alias': 'ci'}, {'name': 'PRODUCTIVE', 'alias': 'prod'},
@@ -310,3 +446,164 @@ class TestView(unittest.TestCase):
                     {'name': 'dog', 'alias': 'cat'}, {'name': 'BANANA', 'alias': 'pyjama'}]
         self.assertEqual(expected, views.filter_environments(envs, ['!dev-ci']))
         self.assertEqual(envs, views.filter_environments(envs, False))
+
+
+class TestMonitor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        flask_app = create_app(port=8080, environment="empty", working_dir="./", greedy_mode=True)
+        flask_app.config.update(DEBUG=True, SECRET_KEY='secret_key')
+        cls.client = flask_app.test_client()
+
+    def setUp(self):
+        config.rdb.flushall()
+        config.rdb.flushdb()
+        config.config = {"environments": [{"name": "group", "alias": "group"}]}
+        page_cache.clear()
+        view_util.tiles.reset()
+        config.rdb.set('marathon::/group/mammal/dog', json.dumps(testdata_helper.get_task(name='dog',
+                                                                                           vertical='mammal')))
+        config.rdb.sadd('all-services', 'marathon::/group/mammal/dog')
+        allocation.clear()
+        ranking.clear()
+        snapshot.publish([('marathon::/group/mammal/dog', testdata_helper.get_task(name='dog', vertical='mammal'))])
+
+    def test_monitor_is_cached_per_query_and_version(self):
+        with mock.patch('app.views.render_monitor', wraps=views.render_monitor) as render_monitor:
+            first = self.client.get("/monitor?level=0&jobs=true", buffered=True)
+            second = self.client.get("/monitor?jobs=true&level=0", buffered=True)
+            self.client.get("/monitor/cinema?jobs=true&level=0", buffered=True)
+            snapshot.publish()
+            self.client.get("/monitor?jobs=true&level=0", buffered=True)
+
+        self.assertEqual(200, first.status_code)
+        self.assertIn('dog', first.data.decode())
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(3, render_monitor.call_count)
+        self.assertEqual({'hits': 1, 'misses': 3, 'size': 1, 'hitRate': 0.25}, page_cache.get_counters())
+
+    def test_monitor_json(self):
+        response = self.client.get("/monitor?level=0", headers={"Accept": "application/json"})
+        data = json.loads(response.data.decode())
+
+        self.assertEqual('application/json', response.mimetype)
+        self.assertEqual(snapshot.get_version(), data["version"])
+        self.assertEqual(['no_source::dog'], data["services_by_severity"]["mammal"])
+        self.assertEqual(['all', 'mammal'], data["tabs"])
+        self.assertIn('text/html', self.client.get("/monitor?level=0").mimetype)
+
+    def test_page_cache_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put('a', 'page a')
+        cache.put('b', 'page b')
+        cache.get('a')
+        cache.put('c', 'page c')
+
+        self.assertEqual('page a', cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+
+    def test_page_cache_drops_older_versions(self):
+        page_cache.put(1, 'a', 'page a')
+        page_cache.put(1, 'b', 'page b')
+        page_cache.put(2, 'a', 'new page a')
+        page_cache.put(1, 'b', 'late page b')
+
+        self.assertEqual(1, page_cache.get_counters()['size'])
+        self.assertEqual('new page a', page_cache.get(2, 'a'))
+        self.assertIsNone(page_cache.get(1, 'a'))
+        self.assertIsNone(page_cache.get(2, 'b'))
+
+    def test_monitor_not_modified(self):
+        response = self.client.get("/monitor?level=2&env=group&refresh=30")
+        etag = response.headers['ETag']
+
+        with mock.patch('app.views.render_monitor') as render_monitor, \
+                mock.patch.object(config.rdb, 'get', side_effect=AssertionError):
+            not_modified = self.client.get("/monitor?refresh=30&env=group&level=2", headers={'If-None-Match': etag})
+        self.assertEqual(304, not_modified.status_code)
+        self.assertEqual(b'', not_modified.data)
+        self.assertEqual(etag, not_modified.headers['ETag'])
+        render_monitor.assert_not_called()
+
+        self.assertEqual(200, self.client.get("/monitor/cinema?refresh=30&env=group&level=2",
+                                              headers={'If-None-Match': etag}).status_code)
+        self.assertEqual(200, self.client.get("/monitor?refresh=30&env=group&level=2",
+                                              headers={'If-None-Match': etag,
+                                                       'Accept': 'application/json'}).status_code)
+        snapshot.publish()
+        changed = self.client.get("/monitor?refresh=30&env=group&level=2", headers={'If-None-Match': etag})
+        self.assertEqual(200, changed.status_code)
+        self.assertNotEqual(etag, changed.headers['ETag'])
+
+    def test_monitor_stream(self):
+        response = self.client.get("/monitor/stream")
+
+        self.assertEqual('text/event-stream', response.mimetype)
+        self.assertEqual('no-cache', response.headers['Cache-Control'])
+        self.assertEqual(b"retry: 5000\n\n", next(response.response))
+        response.close()
+
+    def test_monitor_marks_tiles(self):
+        html = self.client.get("/monitor?level=0").data.decode()
+
+        self.assertIn('data-app="no_source::/group/vertical/name"', html)
+        self.assertNotIn('live_updates.js', html)
+        self.assertIn('live_updates.js', self.client.get("/monitor?live=true").data.decode())
+
+    def test_monitor_is_streamed(self):
+        response = self.client.get("/monitor?tab=mammal")
+
+        self.assertNotIn('Content-Length', response.headers)
+        html = response.data.decode()
+        self.assertLess(html.index('id="mammal"'), html.index('id="all"'))
+
+        cached = self.client.get("/monitor?tab=mammal")
+        self.assertEqual(str(len(cached.data)), cached.headers['Content-Length'])
+        self.assertEqual(html, cached.data.decode())
+
+    def test_monitor_is_not_cached_when_stream_is_aborted(self):
+        response = self.client.get("/monitor?tab=all")
+        next(iter(response.response))
+        response.close()
+
+        self.assertEqual(0, page_cache.get_counters()['size'])
+
+    def test_monitor_renders_only_the_requested_tab(self):
+        html = self.client.get("/monitor?tab=mammal&lazy_tabs=true").data.decode()
+
+        self.assertIn('lazy_tabs.js', html)
+        self.assertEqual(1, html.count('data-app='))
+        self.assertIn('data-fragment="/monitor/tab/all?tab=mammal&amp;lazy_tabs=true"', html)
+        self.assertNotIn('data-fragment="/monitor/tab/mammal', html)
+        self.assertEqual(2, self.client.get("/monitor?tab=mammal").data.decode().count('data-app='))
+
+    def test_monitor_tab(self):
+        response = self.client.get("/monitor/tab/all?level=0")
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn('data-app="no_source::/group/vertical/name"', response.data.decode())
+        self.assertNotIn('<html>', response.data.decode())
+        etag = response.headers['ETag']
+        self.assertNotEqual(etag, self.client.get("/monitor?level=0").headers['ETag'])
+        self.assertEqual(304, self.client.get("/monitor/tab/all?level=0",
+                                              headers={'If-None-Match': etag}).status_code)
+        self.assertEqual(404, self.client.get("/monitor/tab/bird").status_code)
+
+    def test_monitor_reuses_rendered_tiles(self):
+        first = self.client.get("/monitor?tab=mammal").data.decode()
+        self.assertEqual({'hits': 0, 'misses': 2, 'size': 2, 'hitRate': 0.0}, view_util.tiles.get_counters())
+
+        self.client.get("/monitor?tab=all").data
+        self.assertEqual({'hits': 2, 'misses': 2, 'size': 2, 'hitRate': 0.5}, view_util.tiles.get_counters())
+
+        self.client.get("/monitor/cinema?tab=mammal").data
+        self.assertEqual(3, view_util.tiles.get_counters()['size'])
+
+        changed = testdata_helper.get_task(name='dog', vertical='mammal', status=3, version='0.2.0')
+        config.rdb.set('marathon::/group/mammal/dog', json.dumps(changed))
+        snapshot.publish([('marathon::/group/mammal/dog', changed)])
+        second = self.client.get("/monitor?tab=mammal").data.decode()
+        self.assertIn('0.1.0', first)
+        self.assertIn('0.2.0', second)
+        self.assertNotIn('0.1.0', second)
+        self.assertEqual(5, view_util.tiles.get_counters()['size'])